@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Bulk classification benchmark
+Rows per second for classify_stream() on synthetic timestamps, against a per-row lookup baseline
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classify_dates import HolidayCalendar, classify_stream
+from run_pipeline import load_plan
+from scrape_holidays import parse_holidays_html
+
+def load_fixture_calendar(plan_file):
+    """
+    Build the calendar from the plan's fixture pages, so the benchmark runs offline
+    """
+    holidays = []
+    for source in load_plan(plan_file)['sources']:
+        with open(source['fixture'], encoding='utf-8') as f:
+            holidays.extend(parse_holidays_html(f.read(), source['year']))
+    return holidays
+
+def synthetic_timestamps(count, seed):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    span = 2 * 365 * 24 * 3600
+    return [(start + timedelta(seconds=rng.randrange(span))).isoformat() + 'Z' for _ in range(count)]
+
+def per_row_baseline(holidays, timestamps):
+    """
+    One-date-at-a-time lookup, as with the is_holiday_today()-style helpers
+    """
+    for timestamp in timestamps:
+        parsed = datetime.fromisoformat(timestamp[:19])
+        mm_dd = parsed.strftime('%m-%d')
+        next((h for h in holidays if h.year == parsed.year and h.mm_dd == mm_dd), None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk date classification")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--plan', default='scrape_plan.json')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Parser output is chatty; keep it out of the results
+    stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        holidays = load_fixture_calendar(args.plan)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    calendar = HolidayCalendar(holidays)
+
+    timestamps = synthetic_timestamps(args.rows, args.seed)
+    inputs = {
+        'ndjson': [f'{{"id": {i}, "ts": "{ts}"}}\n' for i, ts in enumerate(timestamps)],
+        'csv': ['id,ts\n'] + [f'{i},{ts}\n' for i, ts in enumerate(timestamps)],
+    }
+
+    print(f"=== {args.rows:,} timestamps, chunk size {args.chunk_size:,} ===")
+    for fmt, lines in inputs.items():
+        written = [0]
+
+        def write(text):
+            written[0] += len(text)
+
+        start_time = time.perf_counter()
+        rows = classify_stream(calendar, lines, write, fmt, 'ts', args.chunk_size)
+        elapsed = time.perf_counter() - start_time
+        print(f"{fmt:<8}{rows / elapsed:>14,.0f} rows/s  ({elapsed:.2f}s, {written[0] / 1024 / 1024:.1f}MB out)")
+
+    sample = timestamps[:min(args.rows, 100_000)]
+    start_time = time.perf_counter()
+    per_row_baseline(holidays, sample)
+    elapsed = time.perf_counter() - start_time
+    print(f"{'per-row':<8}{len(sample) / elapsed:>14,.0f} rows/s  (baseline on {len(sample):,} rows)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Holiday record benchmark
+Memory, construction time and field read time of Holiday records versus the
+per-row dicts they replace
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from holiday_record import Holiday
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+def source_rows(count):
+    """
+    Synthetic multi-year calendar rows: (ordinal, weekday, name, type)
+    """
+    start = date(2000, 1, 1).toordinal()
+    rows = []
+    for i in range(count):
+        ordinal = start + (i * 17) % 36500
+        # Fresh strings per row, as parsed text would be
+        rows.append((ordinal, ''.join(WEEKDAYS[ordinal % 7]), f"Holiday {i % 40}", ''.join('public')))
+    return rows
+
+def build_dicts(rows):
+    # Dicts pay for formatting date/mm_dd up front; records format them when read
+    holidays = []
+    for ordinal, day, name, holiday_type in rows:
+        holiday_date = date.fromordinal(ordinal)
+        holidays.append({
+            'date': f"{holiday_date.day} {holiday_date:%b}",
+            'day': day,
+            'name': name,
+            'mm_dd': f"{holiday_date:%m-%d}",
+            'type': holiday_type,
+        })
+    return holidays
+
+def build_records(rows):
+    return [Holiday(ordinal, day, name, holiday_type) for ordinal, day, name, holiday_type in rows]
+
+def read_fields(holidays):
+    """
+    Read every field the XML writer and consumers use, dict-style
+    """
+    for holiday in holidays:
+        holiday['date'], holiday['day'], holiday['name'], holiday['mm_dd']
+
+def measure(builder, rows):
+    """
+    Construction time, field read time and retained memory of the records built from rows
+    """
+    start_time = time.perf_counter()
+    holidays = builder(rows)
+    elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    read_fields(holidays)
+    read_elapsed = time.perf_counter() - start_time
+    del holidays
+
+    # Separate traced run, since tracing slows construction down
+    tracemalloc.start()
+    holidays = builder(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del holidays
+    return elapsed, read_elapsed, retained
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Holiday records against dicts")
+    parser.add_argument('--count', type=int, default=200_000, help="Records to build (default: 200000)")
+    args = parser.parse_args()
+
+    rows = source_rows(args.count)
+    print(f"=== {args.count:,} holidays ===")
+    print(f"{'representation':<16}{'build':>10}{'read':>10}{'build+read':>12}{'memory':>14}{'per record':>12}")
+    for label, builder in (('dict', build_dicts), ('Holiday', build_records)):
+        elapsed, read_elapsed, retained = measure(builder, rows)
+        print(f"{label:<16}{elapsed:>9.3f}s{read_elapsed:>9.3f}s{elapsed + read_elapsed:>11.3f}s"
+              f"{retained / 1024 / 1024:>12.1f}MB{retained / args.count:>11.0f}B")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Page load benchmark
+Compares driver.get() time and bytes transferred with and without resource blocking
+"""
+
+import os
+import sys
+import time
+import argparse
+from statistics import mean, median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrape_holidays import setup_webdriver, wait_for_table, collect_load_metrics
+
+def load_once(url, block_resources, page_load_strategy):
+    """
+    Load the page in a fresh browser and return its load metrics
+    """
+    driver = setup_webdriver(block_resources, page_load_strategy, network_metrics=True)
+    if not driver:
+        raise RuntimeError("Failed to setup WebDriver")
+
+    try:
+        start_time = time.time()
+        driver.get(url)
+        load_time = time.time() - start_time
+        state = wait_for_table(driver, 60)
+        ready_time = time.time() - start_time
+        metrics = collect_load_metrics(driver)
+        metrics.update({
+            'load_time': load_time,
+            'ready_time': ready_time,
+            'table': state['table'],
+        })
+        return metrics
+    finally:
+        driver.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page load with and without resource blocking")
+    parser.add_argument('--url', default=os.getenv('HOLIDAYS_URL', 'https://publicholidays.ph/2025-dates/'))
+    parser.add_argument('--runs', type=int, default=3, help="Loads per configuration (default: 3)")
+    parser.add_argument('--strategy', default='eager', choices=['normal', 'eager', 'none'])
+    args = parser.parse_args()
+
+    results = {}
+    for block_resources in (False, True):
+        label = 'blocking on' if block_resources else 'blocking off'
+        runs = []
+        for run in range(args.runs):
+            metrics = load_once(args.url, block_resources, args.strategy)
+            print(f"{label} run {run + 1}: {metrics['load_time']:.2f}s get, "
+                  f"{metrics['ready_time']:.2f}s to table, {metrics.get('transfer_bytes', 0):,} bytes")
+            runs.append(metrics)
+        results[label] = runs
+
+    print(f"\n=== {args.url} ({args.strategy}, {args.runs} runs each) ===")
+    print(f"{'config':<14}{'get (med)':>12}{'table (med)':>14}{'requests':>10}{'failed':>9}{'bytes (mean)':>16}")
+    for label, runs in results.items():
+        print(f"{label:<14}"
+              f"{median(r['load_time'] for r in runs):>11.2f}s"
+              f"{median(r['ready_time'] for r in runs):>13.2f}s"
+              f"{mean(r.get('requests', 0) for r in runs):>10.0f}"
+              f"{mean(r.get('failed_requests', 0) for r in runs):>9.0f}"
+              f"{mean(r.get('transfer_bytes', 0) for r in runs):>16,.0f}")
+    print("Bytes are encoded (on-the-wire) sizes from the CDP Network.loadingFinished events.")
+
+if __name__ == "__main__":
+    main()
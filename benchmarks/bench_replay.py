@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark
+End-to-end wall time of the fetch and parse pipeline against a local replay
+of a fixture bundle, so runs are reproducible without the live site
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from statistics import median
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import start_replay_server, LATENCY_PROFILES
+from run_pipeline import load_plan
+from scrape_holidays import scrape_holidays, parse_holidays_html
+
+def fetch_and_parse(url, year):
+    """
+    Fetch a replayed page over HTTP and parse it, without a browser
+    """
+    with urlopen(url) as response:
+        page_source = response.read().decode('utf-8')
+    return parse_holidays_html(page_source, year)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrape pipeline against a replayed bundle")
+    parser.add_argument('--plan', default='scrape_plan.json', help="Scrape plan (default: scrape_plan.json)")
+    parser.add_argument('--bundle', default='fixtures', help="Fixture bundle (default: fixtures)")
+    parser.add_argument('--profile', default='ci', choices=list(LATENCY_PROFILES))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--browser', action='store_true',
+                        help="Run scrape_holidays() in Chrome instead of a plain HTTP fetch")
+    args = parser.parse_args()
+
+    # Human-like delays are random sleeps; drop them unless asked for
+    os.environ.setdefault('HUMAN_DELAY_SCALE', '0')
+    random.seed(args.seed)
+
+    server = start_replay_server(args.bundle, args.profile, args.seed)
+    results = {}
+    try:
+        for source in load_plan(args.plan)['sources']:
+            url = server.url_for(source['url'])
+            year = source['year']
+            timings = []
+            for _ in range(args.runs):
+                start_time = time.perf_counter()
+                if args.browser:
+                    holidays = scrape_holidays(url, year)
+                else:
+                    holidays = fetch_and_parse(url, year)
+                timings.append(time.perf_counter() - start_time)
+            results[source['id']] = (timings, len(holidays))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    mode = 'browser' if args.browser else 'http'
+    print(f"\n=== {args.bundle} replayed with '{args.profile}' latency ({mode}, {args.runs} runs, seed {args.seed}) ===")
+    print(f"{'source':<20}{'min':>10}{'median':>10}{'max':>10}{'holidays':>10}")
+    for source_id, (timings, count) in results.items():
+        print(f"{source_id:<20}{min(timings):>9.3f}s{median(timings):>9.3f}s{max(timings):>9.3f}s{count:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Multi-worker server benchmark
+/is-holiday requests per second as holidays_server.py scales from one worker to every core
+"""
+
+import os
+import sys
+import time
+import random
+import socket
+import argparse
+import tempfile
+import subprocess
+import http.client
+from multiprocessing import Pool
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from run_pipeline import load_plan
+from scrape_holidays import parse_holidays_html, create_xml
+
+def write_fixture_calendars(plan_file, directory):
+    """
+    Parse the plan's fixture pages into XML files in directory, so the benchmark runs offline
+    """
+    paths = []
+    for source in load_plan(plan_file)['sources']:
+        with open(source['fixture'], encoding='utf-8') as f:
+            holidays = parse_holidays_html(f.read(), source['year'])
+        path = os.path.join(directory, f"ph_holidays_{source['id']}.xml")
+        create_xml(holidays, path, source['year'])
+        paths.append(path)
+    return paths
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(calendar_files, directory, workers, reuse_port):
+    port = free_port()
+    command = [sys.executable, os.path.join(ROOT, 'holidays_server.py'), '--port', str(port),
+               '--workers', str(workers), '--quiet',
+               '--mapped-calendar', os.path.join(directory, 'ph_holidays.cal')]
+    for path in calendar_files:
+        command += ['--calendar', path]
+    if reuse_port:
+        command.append('--reuse-port')
+    process = subprocess.Popen(command, cwd=directory, stdout=subprocess.DEVNULL)
+
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            connection.getresponse().read()
+            connection.close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Server did not start")
+
+def stop_server(process):
+    process.terminate()
+    process.wait(timeout=10)
+
+def client(task):
+    """
+    One keep-alive client looking up random dates until the deadline; returns its request count
+    """
+    port, deadline, seed = task
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    paths = [f"/is-holiday?date={start + timedelta(days=offset)}" for offset in range(730)]
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    requests = 0
+    while time.time() < deadline:
+        connection.request('GET', rng.choice(paths))
+        connection.getresponse().read()
+        requests += 1
+    connection.close()
+    return requests
+
+def worker_counts(max_workers):
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [max_workers]
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark holidays_server.py across worker counts")
+    parser.add_argument('--max-workers', type=int, default=cpus)
+    parser.add_argument('--clients', type=int, default=max(2, cpus),
+                        help="Concurrent keep-alive clients (default: one per core)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per run (default: 5)")
+    parser.add_argument('--reuse-port', action='store_true', help="Use SO_REUSEPORT workers instead of pre-fork")
+    parser.add_argument('--plan', default='scrape_plan.json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Parser output is chatty; keep it out of the results
+        stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+        try:
+            calendar_files = write_fixture_calendars(args.plan, directory)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+        mode = 'SO_REUSEPORT' if args.reuse_port else 'pre-fork'
+        print(f"=== {mode}, {args.clients} clients, {args.duration:.0f}s per run, {cpus} cores ===")
+        print("Clients share the machine with the server, so treat results as relative.")
+        baseline = None
+        with Pool(args.clients) as pool:
+            for workers in worker_counts(args.max_workers):
+                process, port = start_server(calendar_files, directory, workers, args.reuse_port)
+                try:
+                    deadline = time.time() + args.duration
+                    tasks = [(port, deadline, seed) for seed in range(args.clients)]
+                    requests = sum(pool.map(client, tasks))
+                finally:
+                    stop_server(process)
+                rate = requests / args.duration
+                baseline = baseline or rate
+                print(f"{workers:>3} worker(s){rate:>12,.0f} req/s  ({rate / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
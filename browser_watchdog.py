@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Browser watchdog
+Keeps the chromedriver/Chrome process tree of one scrape under RSS, CPU-time
+and wall-clock limits, kills the whole tree on a breach or once the run is
+over, and reports the peak usage
+"""
+
+import os
+import time
+import resource
+import threading
+
+import psutil
+
+MB = 1024 * 1024
+
+# Limit name: (environment variable, default); 0 disables a limit
+LIMIT_SETTINGS = {
+    'max_rss_mb': ('BROWSER_MAX_RSS_MB', 2048),
+    'max_cpu_seconds': ('BROWSER_MAX_CPU_SECONDS', 600),
+    'max_wall_seconds': ('BROWSER_MAX_WALL_SECONDS', 900),
+}
+
+# Seconds between process tree samples
+DEFAULT_INTERVAL = 1.0
+
+# Seconds between SIGTERM and SIGKILL when killing the tree
+TERMINATE_GRACE = 3.0
+
+def load_limits():
+    """
+    Watchdog limits from the environment
+    """
+    return {key: float(os.getenv(name, default)) for key, (name, default) in LIMIT_SETTINGS.items()}
+
+def create_cgroup(parent, limits):
+    """
+    Create a cgroup v2 child of a delegated parent for one browser tree
+
+    memory.max makes the kernel enforce the RSS limit across the whole tree.
+    """
+    path = os.path.join(parent, f"scrape-{os.getpid()}-{time.monotonic_ns()}")
+    os.mkdir(path)
+    if limits['max_rss_mb']:
+        with open(os.path.join(path, 'memory.max'), 'w') as f:
+            f.write(str(int(limits['max_rss_mb'] * MB)))
+    return path
+
+def kill_processes(processes):
+    """
+    SIGTERM the processes, then SIGKILL whatever is still running after the grace period
+    """
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=TERMINATE_GRACE)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+
+class BrowserWatchdog:
+    """
+    Resource limits and cleanup for the process tree rooted at chromedriver
+
+    Launch chromedriver with popen_kw() and call start() with its pid right
+    after spawning it, before it launches Chrome; then stop() before
+    driver.quit() and reap() after it.
+    """
+
+    def __init__(self, limits=None, interval=None, cgroup_parent=None):
+        self.limits = limits or load_limits()
+        self.interval = interval or float(os.getenv('BROWSER_WATCHDOG_INTERVAL', DEFAULT_INTERVAL))
+        cgroup_parent = cgroup_parent or os.getenv('BROWSER_CGROUP')
+        self.cgroup = create_cgroup(cgroup_parent, self.limits) if cgroup_parent else None
+
+        self.started = time.monotonic()
+        self.started_at = time.time()
+        self.ended = None
+        self.root_pid = None
+        self.processes = {}  # Every process seen in the tree, by pid
+        self.cpu = {}        # Latest CPU seconds per pid, kept after a process exits
+        self.peak_rss = 0
+        self.breach = None
+        self.leftovers_killed = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def apply_limits(self, pid):
+        """
+        Put a freshly spawned process under the rlimit and cgroup; its children inherit both
+
+        Done from the parent rather than in a preexec_fn, which is unsafe when
+        other threads (e.g. a replay server) are running.
+        """
+        cpu_seconds = int(self.limits['max_cpu_seconds'])
+        if cpu_seconds:
+            # Per process, as a backstop; the monitor enforces the total across the tree
+            resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+        if self.cgroup:
+            with open(os.path.join(self.cgroup, 'cgroup.procs'), 'w') as f:
+                f.write(str(pid))
+
+    def popen_kw(self):
+        """
+        Keyword arguments for launching chromedriver under the watchdog
+        """
+        # A new session gives the tree its own process group, which still
+        # finds Chrome processes that were re-parented after chromedriver exited
+        return {'start_new_session': True}
+
+    def start(self, root_pid):
+        """
+        Apply the limits to root_pid and start sampling its process tree
+        """
+        self.root_pid = root_pid
+        try:
+            self.processes[root_pid] = psutil.Process(root_pid)
+            self.apply_limits(root_pid)
+        except (psutil.NoSuchProcess, ProcessLookupError):
+            return
+        self._thread = threading.Thread(target=self._run, name='browser-watchdog', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+            if self.breach:
+                print(f"🛑 Watchdog limit exceeded: {self.breach}; killing the browser")
+                self.kill_tree()
+                break
+
+    def poll(self):
+        """
+        Sample RSS and CPU time across the tree and check the limits
+        """
+        root = self.processes.get(self.root_pid)
+        try:
+            tree = [root] + root.children(recursive=True) if root else []
+        except psutil.NoSuchProcess:
+            tree = []
+
+        rss = 0
+        for process in tree:
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+            except psutil.Error:
+                continue
+            self.processes.setdefault(process.pid, process)
+            self.cpu[process.pid] = times.user + times.system
+        # Summed RSS counts pages shared between Chrome processes more than once,
+        # so the limit errs on the safe side
+        self.peak_rss = max(self.peak_rss, rss)
+
+        cpu_seconds = sum(self.cpu.values())
+        wall_seconds = time.monotonic() - self.started
+        limits = self.limits
+        if limits['max_rss_mb'] and rss > limits['max_rss_mb'] * MB:
+            self.breach = f"RSS {rss / MB:.0f}MB over {limits['max_rss_mb']:g}MB"
+        elif limits['max_cpu_seconds'] and cpu_seconds > limits['max_cpu_seconds']:
+            self.breach = f"CPU {cpu_seconds:.1f}s over {limits['max_cpu_seconds']:g}s"
+        elif limits['max_wall_seconds'] and wall_seconds > limits['max_wall_seconds']:
+            self.breach = f"wall clock {wall_seconds:.1f}s over {limits['max_wall_seconds']:g}s"
+
+    def group_members(self):
+        """
+        Processes still in the tree's process group, including re-parented ones
+        """
+        members = []
+        if not self.root_pid:
+            return members
+        for process in psutil.process_iter(['create_time']):
+            try:
+                # Skip processes older than this run in case the group id was reused
+                if (process.info['create_time'] >= self.started_at - 1
+                        and os.getpgid(process.pid) == self.root_pid):
+                    members.append(process)
+            except (OSError, psutil.Error):
+                continue
+        return members
+
+    def running_processes(self):
+        """
+        Processes of this tree that are still running
+        """
+        running = {process.pid: process for process in self.group_members()}
+        for pid, process in self.processes.items():
+            if pid not in running and process.is_running():
+                running[pid] = process
+        return [process for pid, process in running.items() if pid != os.getpid()]
+
+    def kill_tree(self):
+        """
+        Kill every process of the tree, through the cgroup when there is one
+        """
+        if self.cgroup:
+            try:
+                with open(os.path.join(self.cgroup, 'cgroup.kill'), 'w') as f:
+                    f.write('1')
+            except OSError:
+                pass
+        kill_processes(self.running_processes())
+
+    def stop(self):
+        """
+        Stop sampling, taking one last sample while the browser is still up
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self.ended is None:
+            if not self.breach:
+                self.poll()
+            self.ended = time.monotonic()
+
+    def reap(self):
+        """
+        Kill processes that outlived driver.quit() and remove the cgroup
+        """
+        self.stop()
+        leftovers = self.running_processes()
+        if leftovers:
+            print(f"🧹 Killing {len(leftovers)} leftover browser process(es)")
+            kill_processes(leftovers)
+        self.leftovers_killed += len(leftovers)
+        if self.cgroup:
+            try:
+                os.rmdir(self.cgroup)
+            except OSError:
+                pass
+        return len(leftovers)
+
+    def usage(self):
+        """
+        Peak usage of the run, for the metrics log
+        """
+        ended = self.ended if self.ended is not None else time.monotonic()
+        return {
+            'peak_rss_mb': round(self.peak_rss / MB, 1),
+            'cpu_seconds': round(sum(self.cpu.values()), 2),
+            'wall_seconds': round(ended - self.started, 2),
+            'processes': len(self.processes),
+            'breach': self.breach,
+            'leftovers_killed': self.leftovers_killed,
+        }
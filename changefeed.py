@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Holiday change feed
+Diffs each scrape against the previous output and appends the entry-level
+changes to a sequenced JSON-lines change log
+"""
+
+import os
+import json
+import time
+from datetime import datetime, date
+
+from holiday_record import load_xml
+
+DEFAULT_CHANGE_LOG = 'ph_holidays_changes.jsonl'
+
+def diff_holidays(old, new):
+    """
+    Added, removed, renamed and retyped holidays between two lists of Holiday records, keyed by date
+
+    Each change has its kind under 'change' and the holiday type (public etc.) under 'type'.
+    """
+    old_types, new_types = {}, {}
+    days = {}
+    for holiday in old:
+        old_types.setdefault(holiday.ordinal, {})[holiday.name] = holiday.type
+        days[holiday.ordinal] = holiday.day
+    for holiday in new:
+        new_types.setdefault(holiday.ordinal, {})[holiday.name] = holiday.type
+        days[holiday.ordinal] = holiday.day
+
+    changes = []
+    for ordinal in sorted(set(old_types) | set(new_types)):
+        old_names = old_types.get(ordinal, {})
+        new_names = new_types.get(ordinal, {})
+        removed = sorted(old_names.keys() - new_names.keys())
+        added = sorted(new_names.keys() - old_names.keys())
+        base = {
+            'date': date.fromordinal(ordinal).isoformat(),
+            'day': days[ordinal],
+        }
+
+        # A single name swapped on the same date is a rename
+        if len(removed) == 1 and len(added) == 1:
+            change = dict(base, change='renamed', name=added[0], old_name=removed[0],
+                          type=new_names[added[0]])
+            if old_names[removed[0]] != new_names[added[0]]:
+                change['old_type'] = old_names[removed[0]]
+            changes.append(change)
+        else:
+            for name in removed:
+                changes.append(dict(base, change='removed', name=name, type=old_names[name]))
+            for name in added:
+                changes.append(dict(base, change='added', name=name, type=new_names[name]))
+
+        for name in sorted(old_names.keys() & new_names.keys()):
+            if old_names[name] != new_names[name]:
+                changes.append(dict(base, change='retyped', name=name, type=new_names[name],
+                                    old_type=old_names[name]))
+
+    return changes
+
+def read_changes(log_file, since=0):
+    """
+    Changes from the log with a sequence number above since
+    """
+    if not os.path.exists(log_file):
+        return []
+    with open(log_file, encoding='utf-8') as f:
+        changes = [json.loads(line) for line in f if line.strip()]
+    return [change for change in changes if change['seq'] > since]
+
+def last_sequence(log_file):
+    """
+    Sequence number of the newest change in the log (0 when empty)
+    """
+    if not os.path.exists(log_file):
+        return 0
+    last = 0
+    with open(log_file, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)['seq']
+    return last
+
+def append_changes(log_file, changes, source):
+    """
+    Number changes, stamp them with their source file, and append them to the log
+    """
+    if not changes:
+        return []
+
+    seq = last_sequence(log_file)
+    detected_at = datetime.now().isoformat()
+    entries = []
+    for change in changes:
+        seq += 1
+        entries.append(dict(seq=seq, source=source, detected_at=detected_at, **change))
+
+    with open(log_file, 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return entries
+
+def record_changes(output_file, holidays, log_file=DEFAULT_CHANGE_LOG):
+    """
+    Diff new holidays against the current output file and log the changes
+
+    Call before overwriting output_file. With no previous file every holiday is 'added'.
+    """
+    previous = load_xml(output_file)[0] if os.path.exists(output_file) else []
+    entries = append_changes(log_file, diff_holidays(previous, holidays), output_file)
+    if entries:
+        print(f"📝 {len(entries)} change(s) in {output_file} logged to {log_file} "
+              f"(seq {entries[0]['seq']}-{entries[-1]['seq']})")
+    else:
+        print(f"📝 No changes in {output_file}")
+    return entries
+
+def follow_changes(log_file, since=0, poll_interval=1.0, heartbeat=15.0):
+    """
+    Yield changes above since as they are appended to the log, and None every
+    heartbeat seconds without one. Runs until the caller stops iterating.
+    """
+    position = 0
+    pending = b''
+    last_yield = time.time()
+    while True:
+        size = os.path.getsize(log_file) if os.path.exists(log_file) else 0
+        if size < position:
+            # The log was replaced; start over (already-sent sequences are skipped)
+            position, pending = 0, b''
+        if size > position:
+            with open(log_file, 'rb') as f:
+                f.seek(position)
+                data = f.read()
+                position = f.tell()
+            # Only complete lines; a partially written one waits for the next poll
+            *lines, pending = (pending + data).split(b'\n')
+            for line in lines:
+                if not line.strip():
+                    continue
+                change = json.loads(line)
+                if change['seq'] > since:
+                    since = change['seq']
+                    last_yield = time.time()
+                    yield change
+        if time.time() - last_yield >= heartbeat:
+            last_yield = time.time()
+            yield None
+        time.sleep(poll_interval)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Bulk date classifier
+Labels dates/timestamps as holiday, weekend or working day against the scraped calendar,
+streaming NDJSON or CSV from stdin to stdout in bounded-memory chunks
+"""
+
+import io
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+from datetime import date
+from itertools import islice
+
+from holiday_record import load_xml
+
+# Day type codes stored in the calendar table
+WORKING, WEEKEND, HOLIDAY, UNKNOWN = range(4)
+DAY_TYPES = ('working', 'weekend', 'holiday', 'unknown')
+INVALID = 'invalid'
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Distinct date strings remembered between chunks before the memo is reset
+MEMO_LIMIT = 100000
+
+class HolidayCalendar:
+    """
+    Day type lookup table indexed by date ordinal
+
+    Covers every day of the scraped years: one byte per day, so a lookup is a
+    single index. Days outside the covered years are 'weekend' or 'unknown'.
+    """
+
+    def __init__(self, holidays):
+        years = sorted({holiday.year for holiday in holidays})
+        if not years:
+            raise ValueError("Cannot build a calendar without holidays")
+        self.first_year, self.last_year = years[0], years[-1]
+        self.base = date(self.first_year, 1, 1).toordinal()
+        end = date(self.last_year, 12, 31).toordinal()
+
+        codes = bytearray(end - self.base + 1)
+        for offset in range(len(codes)):
+            if (self.base + offset - 1) % 7 >= 5:  # Ordinal 1 is a Monday
+                codes[offset] = WEEKEND
+        # Years in the range that were never scraped
+        covered = set(years)
+        for year in range(self.first_year, self.last_year + 1):
+            if year not in covered:
+                start = date(year, 1, 1).toordinal() - self.base
+                stop = date(year, 12, 31).toordinal() - self.base + 1
+                for offset in range(start, stop):
+                    if codes[offset] != WEEKEND:
+                        codes[offset] = UNKNOWN
+
+        self.names = {}
+        for holiday in holidays:
+            codes[holiday.ordinal - self.base] = HOLIDAY
+            self.names.setdefault(holiday.ordinal, holiday.name)
+        self.codes = codes
+
+    @classmethod
+    def from_files(cls, xml_files):
+        """
+        Build a calendar from one or more XML files written by create_xml()
+        """
+        holidays = []
+        for xml_file in xml_files:
+            file_holidays, _ = load_xml(xml_file)
+            holidays.extend(file_holidays)
+        return cls(holidays)
+
+    def code_for(self, ordinal):
+        """
+        Day type code for a date ordinal
+        """
+        offset = ordinal - self.base
+        if 0 <= offset < len(self.codes):
+            return self.codes[offset]
+        return WEEKEND if (ordinal - 1) % 7 >= 5 else UNKNOWN
+
+    def classify(self, date_text):
+        """
+        (day type, holiday name) for an ISO date or timestamp string
+        """
+        try:
+            ordinal = date.fromisoformat(date_text[:10]).toordinal()
+        except (TypeError, ValueError):
+            return INVALID, None
+        code = self.code_for(ordinal)
+        return DAY_TYPES[code], self.names.get(ordinal) if code == HOLIDAY else None
+
+    def classify_chunk(self, date_texts, memo):
+        """
+        Classify a chunk of date strings, looking up each distinct date once
+        """
+        if len(memo) > MEMO_LIMIT:
+            memo.clear()
+        for key in set(date_texts).difference(memo):
+            memo[key] = self.classify(key)
+        return [memo[key] for key in date_texts]
+
+def date_key(value):
+    """
+    The date part of a timestamp value, used as the lookup key
+    """
+    return value[:10] if isinstance(value, str) else value
+
+def classify_ndjson_chunk(calendar, lines, field, memo):
+    """
+    Classify NDJSON lines: objects keyed by field, or bare JSON strings
+
+    Lines that are not valid JSON come back as {"value": "<the raw line>", ...}
+    so one bad row never breaks the output stream.
+    """
+    records, keys = [], []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = value = None
+            line = json.dumps(line)
+        else:
+            value = record.get(field) if isinstance(record, dict) else record
+        records.append((line, isinstance(record, dict)))
+        keys.append(date_key(value) if isinstance(value, str) else None)
+
+    out = []
+    labels = {}
+    for (line, is_object), label in zip(records, calendar.classify_chunk(keys, memo)):
+        extra = labels.get(label)
+        if extra is None:
+            extra = labels[label] = f'"day_type": "{label[0]}", "holiday": {json.dumps(label[1])}'
+        if is_object:
+            # Splice the labels into the original object instead of re-serializing it
+            body = line[:-1].rstrip()
+            out.append(f'{body}{", " if body != "{" else ""}{extra}}}\n')
+        else:
+            out.append(f'{{"value": {line}, {extra}}}\n')
+    return ''.join(out)
+
+def csv_text(rows):
+    """
+    Rows formatted as CSV text
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+def classify_csv_chunk(calendar, rows, column_index, memo):
+    """
+    Classify parsed CSV rows, appending day_type and holiday columns
+    """
+    keys = [date_key(row[column_index]) if len(row) > column_index else None for row in rows]
+
+    for row, (day_type, name) in zip(rows, calendar.classify_chunk(keys, memo)):
+        row.append(day_type)
+        row.append(name or '')
+    return csv_text(rows)
+
+def classify_stream(calendar, lines, write, fmt='ndjson', field='date', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Classify an iterable of input lines chunk by chunk, passing each output chunk to write()
+
+    Returns the number of rows classified. Memory is bounded by the chunk size.
+    CSV is chunked by record, so quoted fields may span lines.
+    """
+    lines = iter(lines)
+    memo = {}
+    rows = 0
+
+    if fmt == 'csv':
+        # One reader over the whole stream; chunks are slices of parsed records
+        lines = csv.reader(lines)
+        columns = next(lines, None)
+        if columns is None:
+            return 0
+        if field not in columns:
+            raise ValueError(f"CSV header has no '{field}' column: {columns}")
+        column_index = columns.index(field)
+        write(csv_text([columns + ['day_type', 'holiday']]))
+    elif fmt != 'ndjson':
+        raise ValueError(f"Unknown format '{fmt}', expected 'ndjson' or 'csv'")
+
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            break
+        if fmt == 'csv':
+            write(classify_csv_chunk(calendar, chunk, column_index, memo))
+        else:
+            write(classify_ndjson_chunk(calendar, chunk, field, memo))
+        rows += len(chunk)
+
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify dates as holiday, weekend or working day")
+    parser.add_argument('--calendar', action='append',
+                        help="Holidays XML file (repeatable, default: ph_holidays*.xml)")
+    parser.add_argument('--format', default='ndjson', choices=['ndjson', 'csv'])
+    parser.add_argument('--field', default='date',
+                        help="NDJSON key or CSV column holding the date (default: date)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    calendar_files = args.calendar or sorted(glob.glob('ph_holidays*.xml'))
+    if not calendar_files:
+        print("No holidays XML files found", file=sys.stderr)
+        sys.exit(1)
+    calendar = HolidayCalendar.from_files(calendar_files)
+
+    start_time = time.perf_counter()
+    rows = classify_stream(calendar, sys.stdin, sys.stdout.write, args.format, args.field, args.chunk_size)
+    elapsed = time.perf_counter() - start_time
+    print(f"Classified {rows:,} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ Example script showing how to consume the Philippines holidays XML API
 
 import xml.etree.ElementTree as ET
 import requests
-from datetime import datetime
+from datetime import date, datetime
+from holiday_record import Holiday, UpcomingHoliday
 
 def load_holidays_from_url(url):
     """
@@ -27,27 +28,49 @@ def load_holidays_from_file(filename):
 
 def parse_holidays_xml(root):
     """
-    Parse holidays from XML root element
+    Parse holidays from XML root element into Holiday records
     """
     holidays = []
+    year = int(root.get('year', datetime.now().year))
     
     for holiday in root.findall('holiday'):
-        holiday_data = {
-            'date': holiday.find('date').text,
-            'day': holiday.find('day').text,
-            'name': holiday.find('name').text,
-            'mm_dd': holiday.find('mm_dd').text
-        }
-        holidays.append(holiday_data)
+        holidays.append(Holiday.from_mm_dd(
+            holiday.find('mm_dd').text,
+            year,
+            holiday.find('day').text,
+            holiday.find('name').text,
+            holiday.get('type', 'public')
+        ))
     
     return holidays
 
+def month_day_ordinals(holidays, month, day):
+    """
+    Date ordinals of a month and day in every year the holidays span
+    """
+    ordinals = [holiday.ordinal for holiday in holidays]
+    if not ordinals:
+        return set()
+    first_year = date.fromordinal(min(ordinals)).year
+    last_year = date.fromordinal(max(ordinals)).year
+    targets = set()
+    for year in range(first_year, last_year + 1):
+        try:
+            targets.add(date(year, month, day).toordinal())
+        except ValueError:
+            # 29 Feb outside leap years
+            pass
+    return targets
+
 def find_holiday_by_date(holidays, target_date):
     """
     Find holiday by MM-DD format date
     """
+    # Compare ordinals instead of formatting every record's mm_dd
+    month, day = map(int, target_date.split('-'))
+    targets = month_day_ordinals(holidays, month, day)
     for holiday in holidays:
-        if holiday['mm_dd'] == target_date:
+        if holiday.ordinal in targets:
             return holiday
     return None
 
@@ -55,38 +78,33 @@ def is_holiday_today(holidays):
     """
     Check if today is a holiday
     """
-    today = datetime.now().strftime('%m-%d')
-    return find_holiday_by_date(holidays, today)
+    today = date.today()
+    return find_holiday_by_date(holidays, f"{today:%m-%d}")
 
 def get_upcoming_holidays(holidays, days_ahead=30):
     """
     Get holidays coming up in the next N days
     """
-    from datetime import datetime, timedelta
-    
-    today = datetime.now()
+    today = date.today()
+    today_ordinal = today.toordinal()
     upcoming = []
     
     for holiday in holidays:
-        # Parse the MM-DD format and add current year
-        month, day = map(int, holiday['mm_dd'].split('-'))
-        holiday_date = datetime(today.year, month, day)
+        # Move the holiday's month and day into the current year
+        holiday_date = holiday.as_date
+        ordinal = date(today.year, holiday_date.month, holiday_date.day).toordinal()
         
         # If the holiday has passed this year, check next year
-        if holiday_date < today:
-            holiday_date = datetime(today.year + 1, month, day)
+        if ordinal < today_ordinal:
+            ordinal = date(today.year + 1, holiday_date.month, holiday_date.day).toordinal()
         
         # Check if it's within the specified days ahead
-        days_until = (holiday_date - today).days
-        if 0 <= days_until <= days_ahead:
-            upcoming.append({
-                **holiday,
-                'days_until': days_until,
-                'full_date': holiday_date
-            })
+        days_until = ordinal - today_ordinal
+        if days_until <= days_ahead:
+            upcoming.append(UpcomingHoliday(ordinal, holiday.day, holiday.name, holiday.type, days_until))
     
     # Sort by days until holiday
-    upcoming.sort(key=lambda x: x['days_until'])
+    upcoming.sort(key=lambda x: x.days_until)
     return upcoming
 
 def main():
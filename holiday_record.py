@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Holiday record type
+Compact, immutable holiday records shared by the scraper, the XML writer and the consumer helpers,
+and the XML loader for them (standard library only, so readers need no scraper dependencies)
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from datetime import date, datetime
+from functools import lru_cache
+from collections.abc import Mapping
+
+@lru_cache(maxsize=8192)
+def _date_texts(ordinal):
+    """
+    ("1 Jan", "01-01") texts for a date ordinal, shared by every record on that date
+    """
+    holiday_date = date.fromordinal(ordinal)
+    return f"{holiday_date.day} {holiday_date:%b}", f"{holiday_date:%m-%d}"
+
+class Holiday(Mapping):
+    """
+    Frozen holiday record keyed by date ordinal
+
+    Reads like the old {'date', 'day', 'name', 'mm_dd'} dicts, plus 'type'
+    (holiday['name'], {**holiday}). Records are not dicts, so callers that need
+    one (json.dumps, mutation) should use as_dict().
+    """
+    __slots__ = ('ordinal', 'day', 'name', 'type')
+
+    FIELDS = ('date', 'day', 'name', 'mm_dd', 'type')
+
+    def __init__(self, ordinal, day, name, type='public'):
+        object.__setattr__(self, 'ordinal', ordinal)
+        object.__setattr__(self, 'day', sys.intern(day))
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'type', sys.intern(type))
+
+    @classmethod
+    def from_mm_dd(cls, mm_dd, year, day, name, type='public'):
+        """
+        Build a record from an MM-DD date in the given calendar year
+        """
+        month, day_of_month = map(int, mm_dd.split('-'))
+        return cls(date(year, month, day_of_month).toordinal(), day, name, type)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.ordinal, self.day, self.name, self.type))
+
+    @property
+    def as_date(self):
+        return date.fromordinal(self.ordinal)
+
+    @property
+    def year(self):
+        return self.as_date.year
+
+    @property
+    def date(self):
+        # Same "1 Jan" text as the source table
+        return _date_texts(self.ordinal)[0]
+
+    @property
+    def mm_dd(self):
+        return _date_texts(self.ordinal)[1]
+
+    # Mapping interface for dict-style callers
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def as_dict(self):
+        """
+        Plain dict of the record's fields, e.g. for json.dumps()
+        """
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, Holiday):
+            return (self.ordinal, self.name, self.day, self.type) == \
+                (other.ordinal, other.name, other.day, other.type)
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((self.ordinal, self.name))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.as_date.isoformat()}, {self.name!r}, day={self.day!r}, type={self.type!r})"
+
+class UpcomingHoliday(Holiday):
+    """
+    Holiday occurrence on or after a reference date, with the days left until it
+    """
+    __slots__ = ('days_until',)
+
+    FIELDS = Holiday.FIELDS + ('days_until', 'full_date')
+
+    def __init__(self, ordinal, day, name, type='public', days_until=0):
+        super().__init__(ordinal, day, name, type)
+        object.__setattr__(self, 'days_until', days_until)
+
+    def __reduce__(self):
+        return (type(self), (self.ordinal, self.day, self.name, self.type, self.days_until))
+
+    @property
+    def full_date(self):
+        return datetime.combine(self.as_date, datetime.min.time())
+
+def load_xml(input_file):
+    """
+    Load holiday data and calendar year from an XML file written by create_xml()
+    """
+    root = ET.parse(input_file).getroot()
+    year = int(root.get("year", datetime.now().year))
+
+    holidays = []
+    for holiday_elem in root.findall("holiday"):
+        holidays.append(Holiday.from_mm_dd(
+            holiday_elem.findtext('mm_dd'),
+            year,
+            holiday_elem.findtext('day'),
+            holiday_elem.findtext('name'),
+            holiday_elem.get('type', 'public')
+        ))
+
+    return holidays, year
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Holidays HTTP server
+Serves batch date classification and the holiday change feed over HTTP
+
+Endpoints:
+  POST /classify?format=ndjson|csv&field=date   stream dates in, labelled rows out
+  GET  /changes?since=<seq>                     changes after a sequence number
+  GET  /changes/stream?since=<seq>              Server-Sent Events feed of changes
+  GET  /is-holiday?date=YYYY-MM-DD              classify a single date
+  GET  /health
+
+With --workers N a loader process compiles the calendar into a memory-mapped
+file and forks N workers that share it; see mapped_calendar.py
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import signal
+import socket
+import argparse
+from itertools import chain
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from classify_dates import HolidayCalendar, classify_stream, DEFAULT_CHUNK_SIZE, INVALID
+from mapped_calendar import compile_calendar, CalendarHandle
+from changefeed import read_changes, last_sequence, follow_changes, DEFAULT_CHANGE_LOG
+
+DEFAULT_MAPPED_CALENDAR = 'ph_holidays.cal'
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# Longest request body line, newline included; longer lines are skipped, not buffered
+MAX_LINE_BYTES = 64 * 1024
+
+# Row emitted in place of an over-long line, so it comes back labelled 'invalid'
+LINE_TOO_LONG = {
+    'ndjson': '{"error": "line too long"}\n',
+    'csv': '<line too long>\n',
+}
+
+def iter_chunked_lines(rfile, too_long):
+    """
+    Decode a chunked transfer-encoded request body into text lines
+
+    Lines over MAX_LINE_BYTES are dropped as they arrive and replaced by too_long.
+    """
+    pending = b''
+    skipping = False
+    while True:
+        size = int(rfile.readline(MAX_LINE_BYTES).split(b';', 1)[0].strip() or b'0', 16)
+        if size == 0:
+            # Skip trailers up to the blank line
+            while rfile.readline(MAX_LINE_BYTES) not in (b'\r\n', b'\n', b''):
+                pass
+            break
+        while size > 0:
+            data = rfile.read(min(size, MAX_LINE_BYTES))
+            if not data:
+                return
+            size -= len(data)
+            if skipping:
+                end = data.find(b'\n')
+                if end < 0:
+                    continue
+                data = data[end + 1:]
+                skipping = False
+            *lines, pending = (pending + data).split(b'\n')
+            for line in lines:
+                yield too_long if len(line) >= MAX_LINE_BYTES else line.decode('utf-8') + '\n'
+            if len(pending) >= MAX_LINE_BYTES:
+                pending = b''
+                skipping = True
+                yield too_long
+        rfile.readline(MAX_LINE_BYTES)  # CRLF after each chunk
+    if pending:
+        yield pending.decode('utf-8')
+
+def iter_sized_lines(rfile, length, too_long):
+    """
+    Read a Content-Length request body as text lines without buffering it whole
+
+    Lines over MAX_LINE_BYTES are skipped and replaced by too_long.
+    """
+    remaining = length
+    while remaining > 0:
+        limit = min(remaining, MAX_LINE_BYTES)
+        line = rfile.readline(limit)
+        if not line:
+            break
+        remaining -= len(line)
+        if len(line) < limit or line.endswith(b'\n') or not remaining:
+            yield line.decode('utf-8')
+            continue
+        # Read through to the end of the over-long line
+        while remaining > 0 and not line.endswith(b'\n'):
+            line = rfile.readline(min(remaining, MAX_LINE_BYTES))
+            if not line:
+                break
+            remaining -= len(line)
+        yield too_long
+
+class HolidaysHandler(BaseHTTPRequestHandler):
+    """
+    Request handler for the holidays server
+    """
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients wait out a delayed ACK on every small response
+    disable_nagle_algorithm = True
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        if not self.server.quiet:
+            super().log_request(code, size)
+
+    def write_chunk(self, text):
+        data = text.encode('utf-8')
+        if data:
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+
+    def request_lines(self, fmt):
+        too_long = LINE_TOO_LONG[fmt]
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            return iter_chunked_lines(self.rfile, too_long)
+        return iter_sized_lines(self.rfile, int(self.headers.get('Content-Length') or 0), too_long)
+
+    def since(self, query):
+        # SSE clients resume with Last-Event-ID; it wins over ?since
+        value = self.headers.get('Last-Event-ID') or query.get('since', ['0'])[0]
+        return int(value)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif url.path == '/is-holiday':
+            date_text = query.get('date', [''])[0]
+            day_type, name = self.server.current_calendar().classify(date_text)
+            if day_type == INVALID:
+                self.send_json(400, {'error': 'date must be YYYY-MM-DD'})
+                return
+            self.send_json(200, {'date': date_text[:10], 'day_type': day_type, 'holiday': name})
+        elif url.path in ('/changes', '/changes/stream'):
+            try:
+                since = self.since(query)
+            except ValueError:
+                self.send_json(400, {'error': 'since must be an integer sequence number'})
+                return
+            if url.path == '/changes':
+                change_log = self.server.change_log
+                changes = read_changes(change_log, since)
+                last_seq = changes[-1]['seq'] if changes else last_sequence(change_log)
+                self.send_json(200, {'changes': changes, 'last_seq': last_seq})
+            else:
+                self.stream_changes(since)
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def stream_changes(self, since):
+        """
+        Server-Sent Events: backlog after since, then new changes as they are logged
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            self.wfile.flush()
+            for change in follow_changes(self.server.change_log, since):
+                if change is None:
+                    event = ": keep-alive\n\n"
+                else:
+                    event = f"id: {change['seq']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+                self.wfile.write(event.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away
+            pass
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        # Error responses leave the request body unread, so don't reuse the connection
+        self.close_connection = True
+        if url.path != '/classify':
+            self.send_json(404, {'error': 'not found'})
+            return
+
+        query = parse_qs(url.query)
+        fmt = query.get('format', ['ndjson'])[0]
+        field = query.get('field', ['date'])[0]
+        if fmt not in CONTENT_TYPES:
+            self.send_json(400, {'error': f"unknown format '{fmt}'"})
+            return
+
+        lines = self.request_lines(fmt)
+        if fmt == 'csv':
+            # Validate the header before committing to a streamed 200 response
+            header = next(lines, '')
+            if field not in next(csv.reader([header]), []):
+                self.send_json(400, {'error': f"CSV header has no '{field}' column"})
+                return
+            lines = chain([header], lines)
+
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPES[fmt])
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        rows = classify_stream(self.server.current_calendar(), lines, self.write_chunk, fmt, field,
+                               self.server.chunk_size)
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = False
+        self.log_message("classified %d rows", rows)
+
+class HolidaysServer(ThreadingHTTPServer):
+    """
+    HTTP server holding the compiled holiday calendar
+
+    calendar is a HolidayCalendar, or a CalendarHandle whose current mapping is
+    used for each request.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, calendar, chunk_size=DEFAULT_CHUNK_SIZE, change_log=DEFAULT_CHANGE_LOG,
+                 reuse_port=False, quiet=False):
+        self.calendar = calendar
+        self.chunk_size = chunk_size
+        self.change_log = change_log
+        self.reuse_port = reuse_port
+        self.quiet = quiet
+        super().__init__(address, HolidaysHandler)
+
+    def server_bind(self):
+        if self.reuse_port:
+            # Each worker binds its own socket and the kernel spreads connections across them
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def current_calendar(self):
+        current = getattr(self.calendar, 'current', None)
+        return current() if current else self.calendar
+
+def calendar_mtimes(calendar_files):
+    """
+    Modification times of the calendar XML files, to notice a new scrape
+    """
+    return {path: os.path.getmtime(path) for path in calendar_files if os.path.exists(path)}
+
+def run_worker(server, args):
+    """
+    Worker process body: serve requests against the shared mapped calendar
+    """
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    if server is None:
+        server = HolidaysServer((args.host, args.port), None, args.chunk_size, args.change_log,
+                                reuse_port=True, quiet=args.quiet)
+    server.calendar = CalendarHandle(args.mapped_calendar, args.reload_interval)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+
+def spawn_worker(server, args):
+    """
+    Fork one worker; returns its pid in the loader
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(server, args)
+        finally:
+            os._exit(0)
+    return pid
+
+def serve_workers(args, find_calendar_files):
+    """
+    Loader process: compile the calendar, fork the workers, then recompile when
+    the XML files change and restart workers that die
+    """
+    calendar_files = find_calendar_files()
+    mtimes = calendar_mtimes(calendar_files)
+    calendar = HolidayCalendar.from_files(calendar_files)
+    version = compile_calendar(calendar, args.mapped_calendar)
+    print(f"📅 Compiled calendar {calendar.first_year}-{calendar.last_year} into "
+          f"{args.mapped_calendar} (version {version})")
+    del calendar
+
+    # Pre-fork: one listening socket bound here and inherited by every worker.
+    # With SO_REUSEPORT each worker binds its own socket instead.
+    server = None
+    port = args.port
+    if not args.reuse_port:
+        server = HolidaysServer((args.host, args.port), None, args.chunk_size, args.change_log,
+                                quiet=args.quiet)
+        port = server.server_address[1]
+    elif not hasattr(socket, 'SO_REUSEPORT'):
+        print("SO_REUSEPORT is not supported on this platform")
+        sys.exit(1)
+
+    workers = {spawn_worker(server, args) for _ in range(args.workers)}
+    mode = 'SO_REUSEPORT' if args.reuse_port else 'pre-fork'
+    print(f"🌐 Serving on http://{args.host}:{port}/ with {args.workers} {mode} worker(s)")
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    try:
+        while not stopping:
+            time.sleep(args.reload_interval)
+
+            calendar_files = find_calendar_files()
+            current = calendar_mtimes(calendar_files)
+            if current and current != mtimes:
+                mtimes = current
+                try:
+                    version = compile_calendar(HolidayCalendar.from_files(calendar_files),
+                                               args.mapped_calendar)
+                    print(f"🔄 Recompiled calendar (version {version})")
+                except Exception as e:
+                    # Keep serving the previous version
+                    print(f"❌ Error recompiling calendar: {e}")
+
+            while workers:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if not pid:
+                    break
+                workers.discard(pid)
+                if not stopping:
+                    print(f"⚠️  Worker {pid} exited, starting a new one")
+                    workers.add(spawn_worker(server, args))
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in workers:
+            os.waitpid(pid, 0)
+        if server is not None:
+            server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve batch holiday classification over HTTP")
+    parser.add_argument('--calendar', action='append',
+                        help="Holidays XML file (repeatable, default: ph_holidays*.xml)")
+    parser.add_argument('--host', default=os.getenv('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '8080')))
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--change-log', default=os.getenv('CHANGE_LOG', DEFAULT_CHANGE_LOG),
+                        help=f"Change log served by /changes (default: {DEFAULT_CHANGE_LOG})")
+    parser.add_argument('--workers', type=int,
+                        help="Fork this many worker processes sharing a memory-mapped calendar")
+    parser.add_argument('--reuse-port', action='store_true',
+                        help="Let each worker bind its own SO_REUSEPORT socket instead of sharing one")
+    parser.add_argument('--mapped-calendar', default=os.getenv('MAPPED_CALENDAR', DEFAULT_MAPPED_CALENDAR),
+                        help=f"Compiled calendar file shared by the workers (default: {DEFAULT_MAPPED_CALENDAR})")
+    parser.add_argument('--reload-interval', type=float, default=1.0,
+                        help="Seconds between checks for new calendar data (default: 1)")
+    parser.add_argument('--quiet', action='store_true', help="Don't log each request")
+    args = parser.parse_args()
+
+    def find_calendar_files():
+        return args.calendar or sorted(glob.glob('ph_holidays*.xml'))
+
+    calendar_files = find_calendar_files()
+    if not calendar_files:
+        print("No holidays XML files found")
+        sys.exit(1)
+    if args.workers:
+        serve_workers(args, find_calendar_files)
+        return
+
+    calendar = HolidayCalendar.from_files(calendar_files)
+    print(f"📅 Loaded calendar {calendar.first_year}-{calendar.last_year} from {', '.join(calendar_files)}")
+
+    server = HolidaysServer((args.host, args.port), calendar, args.chunk_size, args.change_log,
+                            quiet=args.quiet)
+    print(f"🌐 Serving on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped holiday calendar
+Compiles a HolidayCalendar into a read-only file that any number of worker
+processes can map and query without parsing or copying it
+"""
+
+import os
+import mmap
+import time
+import struct
+from bisect import bisect_left
+
+from classify_dates import HolidayCalendar
+
+MAGIC = b'PHCAL001'
+
+# magic, version, base ordinal, days, first year, last year, holiday count
+HEADER = struct.Struct('<8sQIIHHI')
+
+def _align(offset, size=4):
+    return (offset + size - 1) // size * size
+
+def read_version(path):
+    """
+    Version number of a compiled calendar file (0 if it does not exist)
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic, version, *_ = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return 0
+    return version if magic == MAGIC else 0
+
+def compile_calendar(calendar, path):
+    """
+    Write a calendar to path with the next version number, replacing the file atomically
+
+    Layout after the header: one day type byte per day, then (4-byte aligned)
+    native-order uint32 holiday ordinals, uint32 name offsets (count + 1) and the
+    UTF-8 names. The file is meant for the host that compiled it.
+    """
+    version = read_version(path) + 1
+    ordinals = sorted(calendar.names)
+    names = [calendar.names[ordinal].encode('utf-8') for ordinal in ordinals]
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+
+    header = HEADER.pack(MAGIC, version, calendar.base, len(calendar.codes),
+                         calendar.first_year, calendar.last_year, len(ordinals))
+    codes_end = HEADER.size + len(calendar.codes)
+    padding = b'\0' * (_align(codes_end) - codes_end)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(calendar.codes)
+        f.write(padding)
+        f.write(struct.pack(f'={len(ordinals)}I', *ordinals))
+        f.write(struct.pack(f'={len(offsets)}I', *offsets))
+        f.write(b''.join(names))
+    # Workers still mapping the old file keep reading its (unlinked) inode
+    os.replace(temp_path, path)
+    return version
+
+class MappedNames:
+    """
+    Holiday name lookup by ordinal over the mapped name table
+    """
+
+    def __init__(self, view, ordinals_start, count):
+        offsets_start = ordinals_start + 4 * count
+        self.ordinals = view[ordinals_start:offsets_start].cast('I')
+        self.offsets = view[offsets_start:offsets_start + 4 * (count + 1)].cast('I')
+        self.blob = view[offsets_start + 4 * (count + 1):]
+
+    def get(self, ordinal, default=None):
+        index = bisect_left(self.ordinals, ordinal)
+        if index == len(self.ordinals) or self.ordinals[index] != ordinal:
+            return default
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+class MappedCalendar(HolidayCalendar):
+    """
+    Read-only HolidayCalendar backed by a compiled calendar file
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        self.identity = (stat.st_dev, stat.st_ino)
+
+        view = memoryview(self._mmap)
+        magic, self.version, self.base, days, self.first_year, self.last_year, count = \
+            HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled holiday calendar")
+
+        codes_end = HEADER.size + days
+        self.codes = view[HEADER.size:codes_end]
+        self.names = MappedNames(view, _align(codes_end), count)
+
+class CalendarHandle:
+    """
+    Current mapping of a compiled calendar file, re-mapped when the loader replaces it
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.calendar = MappedCalendar(path)
+        self._next_check = 0.0
+
+    def current(self, now=None):
+        """
+        The calendar to use for a request; checks for a newer file at most every check_interval
+        """
+        now = now if now is not None else time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return self.calendar
+            if (stat.st_dev, stat.st_ino) != self.calendar.identity:
+                # Old views stay valid until in-flight requests drop them
+                self.calendar = MappedCalendar(self.path)
+        return self.calendar
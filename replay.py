@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Record/replay harness for the holidays scraper
+Records scraped pages and their timings into a fixture bundle and serves them
+from a local HTTP stand-in with simulated network latency
+"""
+
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+MANIFEST_FILE = 'manifest.json'
+
+# Simulated network conditions: time to first byte (seconds), throughput and
+# extra random delay. 'recorded' replays the load time captured with each page.
+LATENCY_PROFILES = {
+    'instant': {'ttfb': 0.0, 'bytes_per_second': None, 'jitter': 0.0},
+    'lan': {'ttfb': 0.005, 'bytes_per_second': 50_000_000, 'jitter': 0.002},
+    'ci': {'ttfb': 0.25, 'bytes_per_second': 2_000_000, 'jitter': 0.1},
+    'slow-3g': {'ttfb': 2.0, 'bytes_per_second': 50_000, 'jitter': 0.5},
+    'recorded': {'ttfb': None, 'bytes_per_second': None, 'jitter': 0.0},
+}
+
+CHUNK_SIZE = 16 * 1024
+
+def load_manifest(bundle_dir):
+    """
+    Load a bundle manifest, or an empty one if the bundle does not exist yet
+    """
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {'entries': []}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(bundle_dir, manifest):
+    """
+    Write a bundle manifest
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+def record_page(bundle_dir, url, html, timings=None):
+    """
+    Add (or replace) a page and its timings in a fixture bundle
+    """
+    path = urlsplit(url).path or '/'
+    file_name = (re.sub(r'[^A-Za-z0-9]+', '-', path).strip('-') or 'index') + '.html'
+    os.makedirs(bundle_dir, exist_ok=True)
+    with open(os.path.join(bundle_dir, file_name), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    manifest = load_manifest(bundle_dir)
+    manifest['entries'] = [entry for entry in manifest['entries'] if entry['path'] != path]
+    manifest['entries'].append({
+        'path': path,
+        'file': file_name,
+        'source_url': url,
+        'status': 200,
+        'content_type': 'text/html; charset=utf-8',
+        'recorded_at': datetime.now().isoformat(),
+        'timings': timings or {},
+    })
+    save_manifest(bundle_dir, manifest)
+    print(f"📼 Recorded {url} into {bundle_dir}/{file_name} ({len(html):,} characters)")
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Serves bundle entries by path, throttled by the server's latency profile
+    """
+
+    def do_GET(self):
+        entry = self.server.entries.get(urlsplit(self.path).path)
+        if entry is None:
+            self.send_error(404)
+            return
+
+        ttfb, bytes_per_second = self.server.latency_for(entry)
+        time.sleep(ttfb)
+
+        body = entry['body']
+        self.send_response(entry.get('status', 200))
+        self.send_header('Content-Type', entry.get('content_type', 'text/html; charset=utf-8'))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        for offset in range(0, len(body), CHUNK_SIZE):
+            chunk = body[offset:offset + CHUNK_SIZE]
+            self.wfile.write(chunk)
+            if bytes_per_second:
+                time.sleep(len(chunk) / bytes_per_second)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for the recorded site
+    """
+    daemon_threads = True
+
+    def __init__(self, bundle_dir, profile='instant', seed=0, port=0):
+        if profile not in LATENCY_PROFILES:
+            raise ValueError(f"Unknown latency profile '{profile}', "
+                             f"expected one of {', '.join(LATENCY_PROFILES)}")
+        self.profile = LATENCY_PROFILES[profile]
+        self.entries = {}
+        for entry in load_manifest(bundle_dir)['entries']:
+            with open(os.path.join(bundle_dir, entry['file']), 'rb') as f:
+                self.entries[entry['path']] = dict(entry, body=f.read())
+
+        # Seeded so that jitter is the same on every replay
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        super().__init__(('127.0.0.1', port), ReplayHandler)
+
+    def latency_for(self, entry):
+        """
+        Time to first byte and throughput for one response
+        """
+        ttfb = self.profile['ttfb']
+        if ttfb is None:
+            ttfb = entry.get('timings', {}).get('load_time') or 0.0
+        if self.profile['jitter']:
+            with self._random_lock:
+                ttfb += self._random.uniform(0, self.profile['jitter'])
+        return ttfb, self.profile['bytes_per_second']
+
+    def url_for(self, url):
+        """
+        Map a live URL onto the stand-in
+        """
+        return f"http://127.0.0.1:{self.server_address[1]}{urlsplit(url).path or '/'}"
+
+def start_replay_server(bundle_dir, profile='instant', seed=0, port=0):
+    """
+    Start a replay server on a background thread; call shutdown() when done
+    """
+    server = ReplayServer(bundle_dir, profile, seed, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a recorded fixture bundle")
+    parser.add_argument('bundle', nargs='?', default='fixtures', help="Bundle directory (default: fixtures)")
+    parser.add_argument('--profile', default='instant', choices=list(LATENCY_PROFILES))
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=0, help="Seed for latency jitter")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.bundle, args.profile, args.seed, args.port)
+    print(f"📼 Replaying {len(server.entries)} page(s) from {args.bundle} with '{args.profile}' latency")
+    for path in sorted(server.entries):
+        print(f"  http://127.0.0.1:{server.server_address[1]}{path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping replay server")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Scrape plan runner
+Runs the scrape/merge pipeline described by scrape_plan.json, locally or in CI
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Only the standard library at import time, so `matrix` runs before dependencies are installed;
+# the scrape and merge steps import the scraper where they need it
+from replay import start_replay_server, LATENCY_PROFILES
+from changefeed import record_changes, DEFAULT_CHANGE_LOG
+from holiday_record import load_xml
+
+def load_plan(plan_file):
+    """
+    Load the scrape plan and validate its sources
+    """
+    with open(plan_file, encoding='utf-8') as f:
+        plan = json.load(f)
+
+    plan.setdefault('artifacts_dir', 'artifacts')
+    plan.setdefault('change_log', DEFAULT_CHANGE_LOG)
+    seen = set()
+    for source in plan['sources']:
+        for key in ('id', 'year', 'url', 'output'):
+            if key not in source:
+                raise ValueError(f"Plan source {source} is missing '{key}'")
+        if source['id'] in seen:
+            raise ValueError(f"Duplicate plan source id '{source['id']}'")
+        seen.add(source['id'])
+
+    return plan
+
+def select_sources(plan, source_ids=None):
+    """
+    Return the plan sources matching the given ids (all sources if none given)
+    """
+    if not source_ids:
+        return plan['sources']
+
+    by_id = {source['id']: source for source in plan['sources']}
+    unknown = [source_id for source_id in source_ids if source_id not in by_id]
+    if unknown:
+        raise ValueError(f"Unknown plan source(s): {', '.join(unknown)}")
+    return [by_id[source_id] for source_id in source_ids]
+
+def artifact_path(plan, source):
+    """
+    Path of the per-source XML artifact produced by the scrape step
+    """
+    return os.path.join(plan['artifacts_dir'], f"{source['id']}.xml")
+
+def scrape_source(plan, source, offline=False, replay_server=None):
+    """
+    Scrape one plan source into its artifact file
+    """
+    from scrape_holidays import scrape_holidays, parse_holidays_html, create_xml
+
+    print(f"\n=== Scraping plan source '{source['id']}' ({source['year']}) ===")
+
+    if offline:
+        fixture = source.get('fixture')
+        if not fixture:
+            print(f"❌ Source '{source['id']}' has no fixture page for offline runs")
+            return False
+        print(f"📂 Reading fixture page: {fixture}")
+        with open(fixture, encoding='utf-8') as f:
+            holidays = parse_holidays_html(f.read(), source['year'])
+    elif replay_server:
+        holidays = scrape_holidays(replay_server.url_for(source['url']), source['year'])
+    else:
+        holidays = scrape_holidays(source['url'], source['year'])
+
+    if not holidays:
+        print(f"❌ No holidays found for source '{source['id']}'")
+        return False
+
+    os.makedirs(plan['artifacts_dir'], exist_ok=True)
+    create_xml(holidays, artifact_path(plan, source), source['year'])
+    return True
+
+def merge(plan, output_files=None):
+    """
+    Merge per-source artifacts into the output files named by the plan,
+    logging what changed in each output to the plan's change log
+
+    output_files limits the merge to those outputs (default: every output in the plan).
+    """
+    from scrape_holidays import create_xml
+
+    print("\n=== Merging scrape artifacts ===")
+
+    # Group sources by the output file they feed
+    outputs = {}
+    for source in plan['sources']:
+        if output_files is None or source['output'] in output_files:
+            outputs.setdefault(source['output'], []).append(source)
+
+    merged_files = []
+    for output_file, sources in outputs.items():
+        years = {source['year'] for source in sources}
+        if len(years) > 1:
+            raise ValueError(f"Sources for {output_file} disagree on year: {sorted(years)}")
+
+        merged = {}
+        for source in sources:
+            path = artifact_path(plan, source)
+            if not os.path.exists(path):
+                print(f"⚠️  Missing artifact for source '{source['id']}': {path}")
+                continue
+            holidays, _ = load_xml(path)
+            print(f"  📥 {path}: {len(holidays)} holidays")
+            for holiday in holidays:
+                merged.setdefault((holiday.ordinal, holiday.name), holiday)
+
+        if not merged:
+            print(f"⚠️  No artifacts to merge for {output_file}, keeping existing file")
+            continue
+
+        holidays = [merged[key] for key in sorted(merged)]
+        record_changes(output_file, holidays, plan['change_log'])
+        create_xml(holidays, output_file, years.pop())
+        merged_files.append(output_file)
+
+    print(f"✅ Merged {len(merged_files)} output file(s)")
+    return merged_files
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the holidays scrape plan")
+    parser.add_argument('target', choices=['matrix', 'scrape', 'merge', 'all'],
+                        help="matrix: print CI matrix JSON; scrape: write per-source artifacts; "
+                             "merge: combine artifacts into output files; all: scrape then merge")
+    parser.add_argument('--plan', default=os.getenv('SCRAPE_PLAN', 'scrape_plan.json'),
+                        help="Scrape plan file (default: scrape_plan.json)")
+    parser.add_argument('--source', action='append', dest='sources',
+                        help="Plan source id to scrape (repeatable, default: all)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Parse fixture pages instead of scraping the live site")
+    parser.add_argument('--replay', choices=list(LATENCY_PROFILES),
+                        help="Scrape with the browser against a local replay of the fixture bundle, "
+                             "using this latency profile")
+    parser.add_argument('--bundle', default='fixtures',
+                        help="Fixture bundle served by --replay (default: fixtures)")
+    parser.add_argument('--written-files',
+                        help="After merging, list the output files and change log written, one per line")
+    args = parser.parse_args()
+
+    plan = load_plan(args.plan)
+
+    if args.target == 'matrix':
+        include = [{'id': source['id'], 'year': source['year']} for source in plan['sources']]
+        print(json.dumps({'include': include}))
+        return
+
+    if args.target in ('scrape', 'all'):
+        replay_server = None
+        if args.replay:
+            replay_server = start_replay_server(args.bundle, args.replay)
+            print(f"📼 Replaying {args.bundle} at {replay_server.url_for('/')} ('{args.replay}' latency)")
+        try:
+            failed = [source['id'] for source in select_sources(plan, args.sources)
+                      if not scrape_source(plan, source, args.offline, replay_server)]
+        finally:
+            if replay_server:
+                replay_server.shutdown()
+                replay_server.server_close()
+        if failed:
+            print(f"❌ Scrape failed for: {', '.join(failed)}")
+            sys.exit(1)
+
+    if args.target in ('merge', 'all'):
+        merged_files = merge(plan)
+        if args.written_files:
+            written = list(merged_files)
+            if merged_files and os.path.exists(plan['change_log']):
+                written.append(plan['change_log'])
+            with open(args.written_files, 'w', encoding='utf-8') as f:
+                f.writelines(f"{path}\n" for path in written)
+        if not merged_files:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Adaptive scrape scheduler
+Long-running alternative to the fixed daily cron: polls each plan source more
+often around historically busy periods and backs off while the data is stable
+"""
+
+import os
+import json
+import time
+import signal
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from run_pipeline import load_plan, scrape_source, merge
+from changefeed import read_changes, last_sequence
+from holiday_record import load_xml
+
+DEFAULT_STATE_FILE = 'scheduler_state.json'
+
+# Checks kept per source for learning change rates
+HISTORY_LIMIT = 2000
+
+# Fixed busy window: next year's holidays are usually proclaimed late in the year
+LATE_YEAR_START = (11, 1)
+
+# Days before (and after) an Eid holiday when its date is usually announced
+EID_LEAD_DAYS = 14
+EID_TRAIL_DAYS = 1
+
+def load_state(state_file):
+    """
+    Load the persisted scheduler state, or a fresh one
+    """
+    if not os.path.exists(state_file):
+        return {'sources': {}}
+    with open(state_file, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state_file, state):
+    """
+    Persist the scheduler state atomically so a crash never leaves half a file
+    """
+    temp_file = f"{state_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+        f.write("\n")
+    os.replace(temp_file, state_file)
+
+def source_state(state, source_id):
+    """
+    Per-source scheduling state, created on first use
+    """
+    return state['sources'].setdefault(source_id, {
+        'history': [],
+        'unchanged_streak': 0,
+        'failures': 0,
+        'next_run': None,
+    })
+
+def eid_windows(plan):
+    """
+    (start, end) date windows around the Eid holidays in the current outputs
+    """
+    windows = []
+    for output_file in {source['output'] for source in plan['sources']}:
+        if not os.path.exists(output_file):
+            continue
+        holidays, _ = load_xml(output_file)
+        for holiday in holidays:
+            if 'eid' in holiday.name.lower():
+                windows.append((holiday.as_date - timedelta(days=EID_LEAD_DAYS),
+                                holiday.as_date + timedelta(days=EID_TRAIL_DAYS)))
+    return windows
+
+def in_busy_window(now, windows):
+    """
+    Whether now falls late in the year or inside an Eid announcement window
+    """
+    if (now.month, now.day) >= LATE_YEAR_START:
+        return True
+    today = now.date()
+    return any(start <= today <= end for start, end in windows)
+
+def learned_change_rate(history, now):
+    """
+    Smoothed share of past checks that found changes, around this week of the year
+    """
+    week = now.isocalendar()[1]
+    nearby = {(week + offset - 1) % 53 + 1 for offset in (-1, 0, 1)}
+    checks = changes = 0
+    for entry in history:
+        if datetime.fromisoformat(entry['at']).isocalendar()[1] in nearby:
+            checks += 1
+            changes += 1 if entry['changed'] else 0
+    # Two phantom unchanged checks keep one lucky hit from pinning the interval
+    return changes / (checks + 2)
+
+def next_interval(source_info, now, busy, config, rng):
+    """
+    Seconds until the next check of a source
+    """
+    if source_info['failures']:
+        interval = config['min_interval'] * 2 ** source_info['failures']
+    else:
+        # Back off while nothing changes...
+        interval = config['base_interval'] * config['backoff'] ** source_info['unchanged_streak']
+        # ...but pull it toward the minimum as far as this time of year has historically changed
+        rate = learned_change_rate(source_info['history'], now)
+        interval = interval * (1 - rate) + config['min_interval'] * rate
+        if busy:
+            interval = min(interval, config['busy_interval'])
+
+    interval *= rng.uniform(1 - config['jitter'], 1 + config['jitter'])
+    return max(config['min_interval'], min(config['max_interval'], interval))
+
+def run_check(plan, source, offline=False):
+    """
+    Scrape one source and merge its output; returns the number of changes, or None on failure
+    """
+    log_file = plan['change_log']
+    before = last_sequence(log_file)
+    if not scrape_source(plan, source, offline):
+        return None
+    # Only this source's output, so stale artifacts of other sources are not logged as its changes
+    merge(plan, [source['output']])
+    return sum(1 for change in read_changes(log_file, before) if change['source'] == source['output'])
+
+def run_due_sources(plan, state, config, rng, offline=False):
+    """
+    Check every source whose next run is due, and schedule its next one
+    """
+    now = datetime.now()
+    busy = in_busy_window(now, eid_windows(plan))
+    for source in plan['sources']:
+        info = source_state(state, source['id'])
+        if info['next_run'] and datetime.fromisoformat(info['next_run']) > now:
+            continue
+
+        print(f"\n⏰ Checking '{source['id']}'{' (busy period)' if busy else ''}")
+        had_output = os.path.exists(source['output'])
+        try:
+            changes = run_check(plan, source, offline)
+        except Exception as e:
+            # One broken source must not take the daemon (and every other source) down with it
+            print(f"❌ Error checking '{source['id']}': {e}")
+            changes = None
+        if changes is None:
+            info['failures'] += 1
+            print(f"❌ Check failed ({info['failures']} in a row)")
+        elif not had_output:
+            # Every holiday is 'added' on the first output; that is a baseline, not a change to learn from
+            info['failures'] = 0
+            print(f"📌 First output for '{source['id']}' written; not counted in the change history")
+        else:
+            info['failures'] = 0
+            info['unchanged_streak'] = 0 if changes else info['unchanged_streak'] + 1
+            info['history'] = (info['history'] + [{'at': now.isoformat(), 'changed': changes}])[-HISTORY_LIMIT:]
+
+        interval = next_interval(info, now, busy, config, rng)
+        info['next_run'] = (now + timedelta(seconds=interval)).isoformat()
+        print(f"📅 Next check of '{source['id']}' in {interval / 3600:.1f}h at {info['next_run']}")
+
+def seconds_until_next(state, plan):
+    """
+    Seconds until the earliest scheduled check
+    """
+    now = datetime.now()
+    waits = []
+    for source in plan['sources']:
+        next_run = state['sources'].get(source['id'], {}).get('next_run')
+        waits.append(0 if not next_run else (datetime.fromisoformat(next_run) - now).total_seconds())
+    return max(0, min(waits))
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive holiday scrape scheduler")
+    parser.add_argument('--plan', default=os.getenv('SCRAPE_PLAN', 'scrape_plan.json'))
+    parser.add_argument('--state', default=os.getenv('SCHEDULER_STATE', DEFAULT_STATE_FILE),
+                        help=f"Persisted scheduler state (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument('--once', action='store_true', help="Check due sources once and exit")
+    parser.add_argument('--offline', action='store_true', help="Parse fixture pages instead of scraping")
+    parser.add_argument('--min-interval', type=float, default=3600, help="Seconds (default: 1h)")
+    parser.add_argument('--base-interval', type=float, default=86400, help="Seconds (default: 24h)")
+    parser.add_argument('--busy-interval', type=float, default=4 * 3600, help="Seconds (default: 4h)")
+    parser.add_argument('--max-interval', type=float, default=7 * 86400, help="Seconds (default: 7d)")
+    parser.add_argument('--backoff', type=float, default=1.5,
+                        help="Interval growth per unchanged check (default: 1.5)")
+    parser.add_argument('--jitter', type=float, default=0.2,
+                        help="Random +/- fraction applied to each interval (default: 0.2)")
+    args = parser.parse_args()
+
+    config = {
+        'min_interval': args.min_interval,
+        'base_interval': args.base_interval,
+        'busy_interval': args.busy_interval,
+        'max_interval': args.max_interval,
+        'backoff': args.backoff,
+        'jitter': args.jitter,
+    }
+    plan = load_plan(args.plan)
+    state = load_state(args.state)
+    rng = random.Random()
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+
+    print(f"🗓️  Scheduling {len(plan['sources'])} source(s), state in {args.state}")
+    try:
+        while not stopping:
+            run_due_sources(plan, state, config, rng, args.offline)
+            save_state(args.state, state)
+            if args.once:
+                break
+            wait = seconds_until_next(state, plan)
+            print(f"💤 Sleeping {wait / 3600:.1f}h")
+            # Sleep in short steps so SIGTERM is handled promptly
+            deadline = time.time() + wait
+            while not stopping and time.time() < deadline:
+                time.sleep(min(60, deadline - time.time()))
+    except KeyboardInterrupt:
+        print("\nStopping scheduler")
+    finally:
+        save_state(args.state, state)
+
+if __name__ == "__main__":
+    main()
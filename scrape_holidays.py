@@ -13,19 +13,79 @@ import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import json
 import base64
+from replay import record_page
+from holiday_record import Holiday, load_xml
+from browser_watchdog import BrowserWatchdog
 
-def setup_webdriver():
+# Origins the scrape actually needs; every other host fails DNS resolution when blocking is on
+DEFAULT_ALLOWED_ORIGINS = [
+    'publicholidays.ph',
+    '*.publicholidays.ph',
+    'challenges.cloudflare.com',
+]
+
+# URL patterns blocked through CDP, including heavy resources served from the allowed origins
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    '*googlesyndication.com*', '*doubleclick.net*', '*google-analytics.com*',
+    '*googletagmanager.com*', '*adservice.google.com*', '*fonts.googleapis.com*',
+    '*fonts.gstatic.com*', '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.webm',
+]
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+def resolve_load_options(block_resources=None, page_load_strategy=None):
+    """
+    Fill in resource blocking and page load strategy from the environment when not given
+    """
+    if block_resources is None:
+        block_resources = os.getenv('BLOCK_RESOURCES', '1') != '0'
+    page_load_strategy = page_load_strategy or os.getenv('PAGE_LOAD_STRATEGY', 'eager')
+    if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Unknown page load strategy '{page_load_strategy}', "
+                         f"expected one of {', '.join(PAGE_LOAD_STRATEGIES)}")
+    return block_resources, page_load_strategy
+
+def env_list(name, default):
+    """
+    Read a comma-separated list from the environment
+    """
+    value = os.getenv(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+class WatchedService(Service):
+    """
+    chromedriver Service that hands the process to a BrowserWatchdog as soon as
+    it is spawned, before chromedriver launches Chrome
+    """
+
+    def __init__(self, watchdog, **kwargs):
+        self.watchdog = watchdog
+        super().__init__(popen_kw=watchdog.popen_kw(), **kwargs)
+
+    def _start_process(self, path):
+        super()._start_process(path)
+        self.watchdog.start(self.process.pid)
+
+def setup_webdriver(block_resources=None, page_load_strategy=None, watchdog=None, network_metrics=False):
     """
     Setup Chrome WebDriver with advanced anti-Cloudflare options
+    
+    With a BrowserWatchdog, chromedriver and Chrome run under its limits.
+    network_metrics turns on the CDP network log read by collect_load_metrics().
     """
+    block_resources, page_load_strategy = resolve_load_options(block_resources, page_load_strategy)
     print("Setting up advanced anti-Cloudflare WebDriver...")
     chrome_options = Options()
+    chrome_options.page_load_strategy = page_load_strategy
+    print(f"Page load strategy: {page_load_strategy}")
     
     # Advanced Chrome arguments for maximum stealth
     options_list = [
@@ -39,7 +99,6 @@ def setup_webdriver():
         '--disable-extensions',
         '--disable-plugins',
         '--disable-images',
-        '--remote-debugging-port=9222',
         '--disable-web-security',
         '--disable-features=VizDisplayCompositor',
         '--ignore-certificate-errors',
@@ -70,6 +129,12 @@ def setup_webdriver():
         '--use-mock-keychain'
     ]
     
+    if block_resources:
+        # Allowlist: resolve only the needed origins (and localhost for replay runs)
+        allowed_origins = env_list('ALLOWED_ORIGINS', DEFAULT_ALLOWED_ORIGINS) + ['localhost']
+        exclusions = ''.join(f', EXCLUDE {origin}' for origin in allowed_origins)
+        options_list.append(f'--host-resolver-rules=MAP * ~NOTFOUND{exclusions}')
+    
     print(f"Adding {len(options_list)} Chrome options...")
     for option in options_list:
         chrome_options.add_argument(option)
@@ -97,14 +162,27 @@ def setup_webdriver():
     print("Adding experimental options...")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_experimental_option("detach", True)
-    print("  Added: excludeSwitches, useAutomationExtension, and detach")
+    print("  Added: excludeSwitches, useAutomationExtension")
+    if network_metrics:
+        # Network events only; chromedriver buffers the log until it is read
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        print("  Added: network performance logging")
     
     try:
         print("Initializing Chrome WebDriver...")
-        driver = webdriver.Chrome(options=chrome_options)
+        if watchdog:
+            driver = webdriver.Chrome(options=chrome_options, service=WatchedService(watchdog))
+        else:
+            driver = webdriver.Chrome(options=chrome_options)
         print("Chrome WebDriver initialized successfully")
         
+        if block_resources:
+            blocked_patterns = env_list('BLOCKED_URL_PATTERNS', DEFAULT_BLOCKED_URL_PATTERNS)
+            print(f"Blocking {len(blocked_patterns)} URL patterns via CDP...")
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_patterns})
+        
         # Execute comprehensive undetected-chromedriver-style anti-detection scripts
         print("Executing undetected-chromedriver-style comprehensive anti-detection scripts...")
         
@@ -333,23 +411,254 @@ def setup_webdriver():
         print(f"Exception type: {type(e).__name__}")
         return None
 
-def scrape_holidays(url):
+# Comprehensive Cloudflare indicators, matched against the page title
+CLOUDFLARE_INDICATORS = [
+    "just a moment", "checking your browser", "cloudflare", "ddos protection",
+    "ray id", "cf-ray", "attention required", "security check", "browser check",
+    "please wait", "verifying you are human", "challenge"
+]
+
+# Elements that only appear on Cloudflare challenge and block pages
+CLOUDFLARE_SELECTORS = [
+    "#challenge-form", "#challenge-running", "#challenge-stage", "#cf-challenge-running",
+    "script[src*='challenge-platform']", "iframe[src*='challenges.cloudflare.com']",
+    "#cf-wrapper", ".cf-browser-verification", ".cf-error-details"
+]
+
+# Readiness probe evaluated in the browser so that one round-trip replaces
+# the title/page_source pulls and per-element lookups
+READINESS_PROBE_SCRIPT = """
+    const indicators = arguments[0];
+    const selectors = arguments[1];
+    const title = document.title || '';
+    const lowerTitle = title.toLowerCase();
+    // Title text and specific markers only; serializing the document on every poll is costly
+    const indicator = indicators.find((text) => lowerTitle.includes(text))
+        || selectors.find((selector) => document.querySelector(selector) !== null)
+        || null;
+    const table = document.querySelector('table.publicholidays');
+    return {
+        title: title,
+        ready_state: document.readyState,
+        challenge: indicator !== null,
+        indicator: indicator,
+        table: table !== null,
+        rows: table ? table.querySelectorAll('tbody tr').length : 0,
+        any_table: document.querySelector('table') !== null,
+        body: document.body !== null,
+        error: location.href.startsWith('chrome-error://')
+            || (document.body !== null && document.body.classList.contains('neterror'))
+    };
+"""
+
+# Random mouse movement/scroll used while waiting out a challenge
+CHALLENGE_ACTIVITY_SCRIPT = """
+    // Random mouse movements
+    const event = new MouseEvent('mousemove', {
+        clientX: Math.random() * window.innerWidth,
+        clientY: Math.random() * window.innerHeight
+    });
+    document.dispatchEvent(event);
+
+    // Occasional scroll
+    if (Math.random() > 0.7) {
+        window.scrollBy(0, Math.random() * 100 - 50);
+    }
+"""
+
+# Row classes that mark a holiday's type; any other class (striping, highlights) is cosmetic
+HOLIDAY_TYPES = ('public', 'regional')
+
+# Table extraction evaluated in the browser with HOLIDAY_TYPES as its argument:
+# returns the holidays table as compact JSON [date, day, name, type] rows,
+# without the ad unit rows
+TABLE_EXTRACT_SCRIPT = """
+    const types = arguments[0];
+    const table = document.querySelector('table.publicholidays');
+    if (!table) {
+        return null;
+    }
+    const rows = [];
+    for (const row of table.querySelectorAll('tbody tr')) {
+        const cells = row.querySelectorAll('td');
+        if (cells.length < 3 || row.querySelector('td.adunit')) {
+            continue;
+        }
+        const type = types.find((name) => row.classList.contains(name)) || 'public';
+        rows.push([0, 1, 2].map((i) => cells[i].textContent.trim()).concat([type]));
+    }
+    return JSON.stringify(rows);
+"""
+
+# Navigation timing for the loaded page. Byte counts come from the CDP network
+# events instead: Resource Timing reports a transferSize of 0 for cross-origin
+# resources without Timing-Allow-Origin, which is most ad and analytics traffic.
+LOAD_METRICS_SCRIPT = """
+    const nav = performance.getEntriesByType('navigation')[0];
+    return {
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_event_ms: nav ? nav.loadEventEnd : null
+    };
+"""
+
+def human_delay(low, high):
+    """
+    Random human-like delay in seconds, scaled by HUMAN_DELAY_SCALE (0 disables the delays)
+    """
+    return random.uniform(low, high) * float(os.getenv('HUMAN_DELAY_SCALE', '1'))
+
+def probe_page_state(driver, activity_script=""):
+    """
+    Return the page readiness status (challenge, table, row count, error page) in one round-trip
+    """
+    return driver.execute_script(activity_script + READINESS_PROBE_SCRIPT,
+                                 CLOUDFLARE_INDICATORS, CLOUDFLARE_SELECTORS)
+
+def wait_for_table(driver, timeout=60, poll_frequency=0.5):
+    """
+    Poll the readiness probe until the holidays table or an error page shows up
+    """
+    deadline = time.time() + timeout
+    while True:
+        state = probe_page_state(driver)
+        if state['table'] or state['error'] or time.time() >= deadline:
+            return state
+        time.sleep(poll_frequency)
+
+def extract_table_rows(driver):
+    """
+    Extract the holidays table rows in the browser, or None when the script path fails
+    """
+    try:
+        payload = driver.execute_script(TABLE_EXTRACT_SCRIPT, HOLIDAY_TYPES)
+    except WebDriverException as e:
+        print(f"⚠️  Table extraction script failed: {e}")
+        return None
+    
+    if not payload:
+        print("⚠️  Table extraction script found no 'publicholidays' table")
+        return None
+    
+    try:
+        rows = json.loads(payload)
+    except ValueError as e:
+        print(f"⚠️  Table extraction script returned invalid JSON: {e}")
+        return None
+    
+    if not rows:
+        print("⚠️  Table extraction script returned no rows")
+        return None
+    
+    print(f"✅ Extracted {len(rows)} table rows in the browser ({len(payload):,} characters)")
+    return rows
+
+def network_totals(driver):
+    """
+    Requests, blocked/failed requests and encoded bytes from the CDP network
+    events in the performance log since the last call
+    """
+    totals = {'requests': 0, 'failed_requests': 0, 'transfer_bytes': 0}
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        method = message.get('method')
+        if method == 'Network.loadingFinished':
+            totals['requests'] += 1
+            totals['transfer_bytes'] += int(message['params'].get('encodedDataLength', 0))
+        elif method == 'Network.loadingFailed':
+            totals['failed_requests'] += 1
+    return totals
+
+def collect_load_metrics(driver, network=True):
+    """
+    Collect timing for the loaded page, plus request count and bytes transferred
+    when the driver was set up with network_metrics
+    """
+    metrics = {}
+    try:
+        metrics.update(driver.execute_script(LOAD_METRICS_SCRIPT))
+        if network:
+            metrics.update(network_totals(driver))
+    except WebDriverException as e:
+        print(f"⚠️  Could not collect load metrics: {e}")
+    return metrics
+
+def record_metrics(metrics):
+    """
+    Append a run's metrics as a JSON line to METRICS_FILE, when set
+    """
+    metrics_file = os.getenv('METRICS_FILE')
+    if not metrics_file:
+        return
+    with open(metrics_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(metrics) + "\n")
+    print(f"📈 Metrics appended to {metrics_file}")
+
+def report_browser_usage(usage):
+    """
+    Print the browser process tree usage collected by the watchdog
+    """
+    print(f"📊 Browser peak usage: {usage['peak_rss_mb']:.0f}MB RSS, {usage['cpu_seconds']:.1f}s CPU, "
+          f"{usage['wall_seconds']:.1f}s wall clock, {usage['processes']} processes")
+    if usage['breach']:
+        print(f"🛑 Browser was killed by the watchdog: {usage['breach']}")
+
+def track_round_trips(driver):
+    """
+    Count WebDriver commands sent by the driver, and the time spent in them, per command name
+    """
+    stats = {'commands': {}, 'seconds': 0.0}
+    execute = driver.execute
+
+    def counted_execute(driver_command, params=None):
+        start_time = time.time()
+        try:
+            return execute(driver_command, params)
+        finally:
+            stats['seconds'] += time.time() - start_time
+            stats['commands'][driver_command] = stats['commands'].get(driver_command, 0) + 1
+
+    driver.execute = counted_execute
+    return stats
+
+def report_round_trips(stats):
+    """
+    Print the WebDriver round-trip summary collected by track_round_trips()
+    """
+    total = sum(stats['commands'].values())
+    print(f"📡 WebDriver round-trips: {total} ({stats['seconds']:.2f}s in commands)")
+    for command, count in sorted(stats['commands'].items(), key=lambda item: -item[1]):
+        print(f"    {command}: {count}")
+
+def scrape_holidays(url, year=None, extract_mode=None, block_resources=None, page_load_strategy=None):
     """
     Scrape holidays from the given URL using advanced anti-Cloudflare Selenium WebDriver
+    
+    extract_mode 'script' reads the table rows in the browser and falls back to
+    parsing the page source; 'html' always parses the page source.
     """
+    extract_mode = extract_mode or os.getenv('EXTRACT_MODE', 'script')
+    block_resources, page_load_strategy = resolve_load_options(block_resources, page_load_strategy)
     print(f"\n=== Starting advanced anti-Cloudflare holiday scraping process ===")
     print(f"Target URL: {url}")
-    
-    driver = setup_webdriver()
+    print(f"Extraction mode: {extract_mode}")
+    print(f"Resource blocking: {'on' if block_resources else 'off'}")
+
+    # The network log is only worth its transfer when the metrics are kept
+    network_metrics = bool(os.getenv('METRICS_FILE'))
+    watchdog = BrowserWatchdog()
+    driver = setup_webdriver(block_resources, page_load_strategy, watchdog, network_metrics)
     if not driver:
         print("❌ Failed to setup WebDriver")
+        watchdog.reap()
         return []
-    
+    round_trips = track_round_trips(driver)
+    metrics = {'url': url}
+
     try:
         print("\n📄 Loading page with advanced anti-Cloudflare WebDriver...")
         
         # Enhanced random delay with human-like patterns
-        delay = random.uniform(3, 7)
+        delay = human_delay(3, 7)
         print(f"⏱️  Adding human-like delay: {delay:.1f} seconds before request...")
         time.sleep(delay)
         
@@ -401,27 +710,16 @@ def scrape_holidays(url):
         """)
         
         # Random post-load delay
-        post_load_delay = random.uniform(2, 4)
+        post_load_delay = human_delay(2, 4)
         print(f"⏱️  Post-load human simulation delay: {post_load_delay:.1f} seconds")
         time.sleep(post_load_delay)
         
         # Enhanced Cloudflare detection and bypass
         print("\n🛡️  Enhanced Cloudflare protection detection...")
-        page_title = driver.title
-        page_source_snippet = driver.page_source[:2000].lower()
-        print(f"📄 Initial page title: {page_title}")
-        
-        # Comprehensive Cloudflare indicators
-        cloudflare_indicators = [
-            "just a moment", "checking your browser", "cloudflare", "ddos protection",
-            "ray id", "cf-ray", "attention required", "security check", "browser check",
-            "please wait", "verifying you are human", "challenge"
-        ]
-        
-        cloudflare_detected = any(
-            indicator in page_title.lower() or indicator in page_source_snippet 
-            for indicator in cloudflare_indicators
-        )
+        state = probe_page_state(driver)
+        print(f"📄 Initial page title: {state['title']}")
+        
+        cloudflare_detected = state['challenge'] and not state['table']
         
         if cloudflare_detected:
             print("⚠️  Advanced Cloudflare protection detected, implementing sophisticated bypass...")
@@ -494,39 +792,24 @@ def scrape_holidays(url):
             
             # Implement sophisticated waiting strategy with multiple attempts
             for attempt in range(4):
-                wait_time = random.uniform(12, 25)
+                wait_time = human_delay(12, 25)
                 print(f"🔄 Cloudflare bypass attempt {attempt + 1}/4: waiting {wait_time:.1f} seconds...")
                 
-                # Simulate realistic human behavior during wait
+                # Simulate realistic human behavior during wait, re-checking the page each time
                 for i in range(int(wait_time)):
                     time.sleep(1)
                     if i % 3 == 0:  # Every 3 seconds, simulate activity
-                        driver.execute_script("""
-                            // Random mouse movements
-                            const event = new MouseEvent('mousemove', {
-                                clientX: Math.random() * window.innerWidth,
-                                clientY: Math.random() * window.innerHeight
-                            });
-                            document.dispatchEvent(event);
-                            
-                            // Occasional scroll
-                            if (Math.random() > 0.7) {
-                                window.scrollBy(0, Math.random() * 100 - 50);
-                            }
-                        """)
+                        state = probe_page_state(driver, CHALLENGE_ACTIVITY_SCRIPT)
+                        if state['table'] or not state['challenge']:
+                            break
                 
                 # Check if challenge is completed
-                current_title = driver.title
-                current_source = driver.page_source[:2000].lower()
-                
-                challenge_completed = not any(
-                    indicator in current_title.lower() or indicator in current_source 
-                    for indicator in cloudflare_indicators
-                )
+                if state['challenge'] and not state['table']:
+                    state = probe_page_state(driver)
                 
-                if challenge_completed:
+                if state['table'] or not state['challenge']:
                     print(f"✅ Cloudflare challenge bypassed successfully on attempt {attempt + 1}!")
-                    print(f"📄 New page title: {current_title}")
+                    print(f"📄 New page title: {state['title']}")
                     break
                     
                 # Additional human simulation between attempts
@@ -555,28 +838,42 @@ def scrape_holidays(url):
         
         # Enhanced page loading detection
         print("\n🔍 Enhanced page elements loading detection...")
-        wait = WebDriverWait(driver, 60)  # Increased timeout
+        print("  Searching for table with class 'publicholidays'...")
+        state = wait_for_table(driver, 60)  # Increased timeout
         
-        try:
-            print("  Searching for table with class 'publicholidays'...")
-            wait.until(EC.presence_of_element_located((By.CLASS_NAME, "publicholidays")))
-            print("  ✅ Found 'publicholidays' table!")
-        except TimeoutException:
-            print("  ⚠️  'publicholidays' table not found, trying enhanced fallback...")
-            try:
-                print("  Searching for any table element...")
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                print("  ✅ Found table element (fallback)")
-            except TimeoutException:
-                print("  ⚠️  No table found, trying final enhanced fallback...")
-                print("  Waiting for page body to load...")
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                print("  ✅ Page body loaded (final fallback)")
-                
-                # Enhanced dynamic content wait
-                dynamic_wait = random.uniform(8, 15)
-                print(f"  ⏱️  Enhanced dynamic content wait: {dynamic_wait:.1f} seconds...")
-                time.sleep(dynamic_wait)
+        if state['error']:
+            print(f"  ❌ Browser error page loaded: {state['title']}")
+            return []
+        if state['table']:
+            print(f"  ✅ Found 'publicholidays' table with {state['rows']} rows!")
+        elif state['any_table']:
+            print("  ⚠️  'publicholidays' table not found, found table element (fallback)")
+        elif state['body']:
+            print("  ⚠️  No table found, page body loaded (final fallback)")
+            
+            # Enhanced dynamic content wait
+            dynamic_wait = human_delay(8, 15)
+            print(f"  ⏱️  Enhanced dynamic content wait: {dynamic_wait:.1f} seconds...")
+            time.sleep(dynamic_wait)
+        else:
+            raise TimeoutException("Page body did not load")
+        
+        metrics.update(collect_load_metrics(driver, network_metrics))
+        metrics.update({
+            'block_resources': block_resources,
+            'page_load_strategy': page_load_strategy,
+            'load_time': round(load_time, 3),
+            'ready_time': round(time.time() - start_time, 3),
+        })
+        if network_metrics:
+            print(f"📈 Page load: {load_time:.2f}s, {metrics.get('requests', 0)} requests, "
+                  f"{metrics.get('transfer_bytes', 0):,} bytes transferred")
+        else:
+            print(f"📈 Page load: {load_time:.2f}s")
+        
+        record_dir = os.getenv('RECORD_DIR')
+        if record_dir:
+            record_page(record_dir, url, driver.page_source, metrics)
         
         # Final human simulation before extraction
         print("🎭 Final human behavior simulation...")
@@ -600,15 +897,21 @@ def scrape_holidays(url):
         """)
         
         # Small delay after final simulation
-        time.sleep(2)
+        time.sleep(human_delay(2, 2))
         
         print("\n📋 Successfully loaded page with advanced anti-Cloudflare WebDriver!")
         
-        # Get page source and parse with BeautifulSoup
-        print("📄 Extracting page source...")
-        page_source = driver.page_source
-        page_size = len(page_source)
-        print(f"✅ Page source extracted ({page_size:,} characters)")
+        rows = None
+        if extract_mode == 'script':
+            print("📄 Extracting table rows in the browser...")
+            rows = extract_table_rows(driver)
+        
+        if not rows:
+            # Get page source once, now that the table is confirmed, and parse with BeautifulSoup
+            print("📄 Extracting page source...")
+            page_source = driver.page_source
+            page_size = len(page_source)
+            print(f"✅ Page source extracted ({page_size:,} characters)")
         
     except TimeoutException as e:
         print(f"❌ Timeout waiting for page to load: {e}")
@@ -617,14 +920,35 @@ def scrape_holidays(url):
         print(f"❌ WebDriver error: {e}")
         print(f"Exception type: {type(e).__name__}")
         return []
+    except Exception as e:
+        # A killed browser surfaces as whatever the dead connection raised
+        if not watchdog.breach:
+            raise
+        print(f"❌ Browser connection lost: {type(e).__name__}")
+        return []
     finally:
+        report_round_trips(round_trips)
+        watchdog.stop()
         print("🔄 Closing WebDriver...")
         try:
             driver.quit()
             print("✅ WebDriver closed successfully")
         except Exception as e:
             print(f"⚠️  Error closing WebDriver: {e}")
+        # driver.quit() does not always take Chrome's child processes with it
+        watchdog.reap()
+        metrics['browser'] = watchdog.usage()
+        report_browser_usage(metrics['browser'])
+        record_metrics(metrics)
     
+    if rows:
+        return build_holidays(rows, year)
+    return parse_holidays_html(page_source, year)
+
+def parse_holidays_html(page_source, year=None):
+    """
+    Parse holidays from a publicholidays.ph page source (live or fixture)
+    """
     print("🍲 Parsing page content with BeautifulSoup...")
     soup = BeautifulSoup(page_source, 'html.parser')
     
@@ -673,73 +997,79 @@ def scrape_holidays(url):
             return []
     
     print("✅ Found holidays table, extracting data...")
-    holidays = []
-    rows = table.find('tbody').find_all('tr')
-    print(f"📊 Processing {len(rows)} table rows...")
+    rows = []
+    table_rows = table.find('tbody').find_all('tr')
+    print(f"📊 Reading {len(table_rows)} table rows...")
     
-    for i, row in enumerate(rows, 1):
+    for i, row in enumerate(table_rows, 1):
         cells = row.find_all('td')
         if len(cells) >= 3 and not row.find('td', class_='adunit'):
-            date_text = cells[0].get_text().strip()
-            day_text = cells[1].get_text().strip()
-            holiday_name = cells[2].get_text().strip()
-            
-            print(f"  Row {i}: Processing '{holiday_name}' on {date_text}")
-            
-            # Skip empty or invalid rows
-            if not date_text or not holiday_name:
-                print(f"    ⚠️  Skipping row {i}: empty date or name")
-                continue
-                
-            # Parse date (format: "1 Jan", "25 Dec", etc.)
-            try:
-                # Add current year for parsing
-                current_year = datetime.now().year
-                date_with_year = f"{date_text} {current_year}"
-                parsed_date = datetime.strptime(date_with_year, "%d %b %Y")
-                
-                # Convert to MM-DD format
-                mm_dd_format = parsed_date.strftime("%m-%d")
-                
-                holidays.append({
-                    'date': date_text,
-                    'day': day_text,
-                    'name': holiday_name,
-                    'mm_dd': mm_dd_format
-                })
-                print(f"    ✅ Added holiday: {holiday_name} ({mm_dd_format})")
-            except ValueError as e:
-                print(f"    ❌ Warning: Could not parse date '{date_text}': {e}")
-                continue
+            classes = row.get('class', [])
+            holiday_type = next((name for name in HOLIDAY_TYPES if name in classes), 'public')
+            rows.append([cell.get_text().strip() for cell in cells[:3]] + [holiday_type])
         else:
             print(f"  Row {i}: Skipping (insufficient cells or ad unit)")
     
+    return build_holidays(rows, year)
+
+def build_holidays(rows, year=None):
+    """
+    Normalize [date, day, name, type] table rows into Holiday records
+    """
+    holidays = []
+    print(f"📊 Processing {len(rows)} holiday rows...")
+    
+    for i, row in enumerate(rows, 1):
+        date_text, day_text, holiday_name = row[:3]
+        holiday_type = row[3] if len(row) > 3 else 'public'
+        print(f"  Row {i}: Processing '{holiday_name}' on {date_text}")
+        
+        # Skip empty or invalid rows
+        if not date_text or not holiday_name:
+            print(f"    ⚠️  Skipping row {i}: empty date or name")
+            continue
+            
+        # Parse date (format: "1 Jan", "25 Dec", etc.)
+        try:
+            # Add the calendar year for parsing
+            current_year = year or datetime.now().year
+            date_with_year = f"{date_text} {current_year}"
+            parsed_date = datetime.strptime(date_with_year, "%d %b %Y")
+            
+            holiday = Holiday(parsed_date.toordinal(), day_text, holiday_name, holiday_type)
+            holidays.append(holiday)
+            print(f"    ✅ Added holiday: {holiday_name} ({holiday.mm_dd})")
+        except ValueError as e:
+            print(f"    ❌ Warning: Could not parse date '{date_text}': {e}")
+            continue
+    
     print(f"\n🎉 Successfully extracted {len(holidays)} holidays!")
     return holidays
 
-def create_xml(holidays, output_file):
+def create_xml(holidays, output_file, year=None):
     """
     Create XML file with holiday data
     """
     root = ET.Element("holidays")
-    root.set("year", str(datetime.now().year))
+    root.set("year", str(year or datetime.now().year))
     root.set("country", "Philippines")
     root.set("last_updated", datetime.now().isoformat())
     
     for holiday in holidays:
         holiday_elem = ET.SubElement(root, "holiday")
+        holiday_elem.set("type", holiday.type)
         
         date_elem = ET.SubElement(holiday_elem, "date")
-        date_elem.text = holiday['date']
+        date_elem.text = holiday.date
         
         day_elem = ET.SubElement(holiday_elem, "day")
-        day_elem.text = holiday['day']
+        day_elem.text = holiday.day
         
         name_elem = ET.SubElement(holiday_elem, "name")
-        name_elem.text = holiday['name']
+        name_elem.text = holiday.name
         
         mm_dd_elem = ET.SubElement(holiday_elem, "mm_dd")
-        mm_dd_elem.text = holiday['mm_dd']
+        mm_dd_elem.text = holiday.mm_dd
     
     # Create the tree and write to file
     tree = ET.ElementTree(root)
@@ -754,10 +1084,11 @@ def main():
     # Default URL - can be overridden by environment variable
     url = os.getenv('HOLIDAYS_URL', 'https://publicholidays.ph/2025-dates/')
     output_file = os.getenv('OUTPUT_FILE', 'ph_holidays.xml')
+    year = int(os.getenv('HOLIDAYS_YEAR') or datetime.now().year)
     
     print(f"Scraping holidays from: {url}")
     
-    holidays = scrape_holidays(url)
+    holidays = scrape_holidays(url, year)
     
     if not holidays:
         print("No holidays found!")
@@ -765,9 +1096,9 @@ def main():
     
     print(f"Found {len(holidays)} holidays:")
     for holiday in holidays:
-        print(f"  {holiday['mm_dd']} - {holiday['name']}")
+        print(f"  {holiday.mm_dd} - {holiday.name}")
     
-    create_xml(holidays, output_file)
+    create_xml(holidays, output_file, year)
     print(f"Successfully created {output_file} with {len(holidays)} holidays")
 
 if __name__ == "__main__":